@@ -46,6 +46,10 @@ import os
 import queue
 from typing import Optional
 
+from queued_logging import get_logger
+
+log = get_logger('mx5.esp32')
+
 # Try to import serial library
 try:
     import serial
@@ -66,6 +70,9 @@ class ESP32SerialHandler:
     USB_PORTS = ['/dev/ttyACM0', '/dev/ttyACM1']
     GPIO_PORT = '/dev/serial0'  # Pi GPIO UART (14/15)
     BAUD_RATE = 115200
+    READ_TIMEOUT = 0.05  # Max time a read blocks waiting for data (bounds queued screen-send latency)
+    MAX_LINE_BYTES = 1024  # Drop a partial line that grows past this (noise / missing newline)
+    RX_CHUNK_BYTES = 4096  # Size of the reusable receive buffer
     
     # Screen mapping (must match ESP32 ScreenMode enum - 8 screens)
     SCREEN_OVERVIEW = 0
@@ -119,6 +126,18 @@ class ESP32SerialHandler:
         self.tpms_last_update = 0                  # timestamp of last TPMS data
         self.tpms_last_update_str = ["--:--:--", "--:--:--", "--:--:--", "--:--:--"]  # HH:MM:SS per tire
         
+        # ESP32 -> Pi frame parsers, keyed by the tag before the first ':'
+        self._frame_handlers = {
+            'TPMS': self._parse_tpms,
+            'TPMS_PSI': self._parse_tpms_psi,        # BLE TPMS pressures: FL,FR,RL,RR
+            'TPMS_TEMP': self._parse_tpms_temp,      # BLE TPMS temperatures: FL,FR,RL,RR
+            'IMU': self._parse_imu,
+            'SCREEN_CHANGED': self._parse_screen_changed,
+            'SETTING': self._parse_setting,          # Single setting changed on ESP32
+            'SELECTION': self._parse_selection,
+            'SETTINGS': self._parse_all_settings,    # All settings - full sync
+        }
+        
         # Load cached TPMS data from disk
         self._load_tpms_cache()
     
@@ -210,12 +229,18 @@ class ESP32SerialHandler:
                 'last_update_str': self.tpms_last_update_str
             }
             
-            with open(TPMS_CACHE_FILE, 'w') as f:
-                json.dump(data, f, indent=2)
-                
-            print(f"TPMS: Saved cache (updated tires: {updated_tires if updated_tires else 'all'})")
+            # Serialize once and hand the file a single bytes block, then
+            # rename so readers never see a half-written cache. No fsync -
+            # this runs on the serial read thread and SD card syncs stall it.
+            payload = json.dumps(data, indent=2).encode('utf-8')
+            tmp_file = TPMS_CACHE_FILE + '.tmp'
+            with open(tmp_file, 'wb', buffering=0) as f:
+                f.write(payload)
+            os.replace(tmp_file, TPMS_CACHE_FILE)
+
+            log.info(f"TPMS: Saved cache (updated tires: {updated_tires if updated_tires else 'all'})")
         except Exception as e:
-            print(f"TPMS: Failed to save cache: {e}")
+            log.warning(f"TPMS: Failed to save cache: {e}")
     
     def _find_serial_port(self) -> Optional[str]:
         """Auto-detect ESP32 serial port (USB preferred over GPIO)"""
@@ -262,7 +287,7 @@ class ESP32SerialHandler:
             self.serial_conn = serial.Serial(
                 port=port,
                 baudrate=self.BAUD_RATE,
-                timeout=0.1,
+                timeout=self.READ_TIMEOUT,
                 write_timeout=0.1
             )
             self.port = port
@@ -305,7 +330,9 @@ class ESP32SerialHandler:
     def _read_loop(self):
         """Read incoming data from ESP32 and process write queue in background thread.
         Handles automatic reconnection when ESP32 restarts."""
-        buffer = ""
+        buffer = bytearray()  # Partial line bytes (lines are cut out in place)
+        rx_buf = bytearray(self.RX_CHUNK_BYTES)  # Reused for every read
+        rx_view = memoryview(rx_buf)
         last_screen_send = 0  # Rate limiting for screen commands
         last_reconnect_attempt = 0
         reconnect_interval = 2.0  # Try reconnecting every 2 seconds
@@ -318,9 +345,9 @@ class ESP32SerialHandler:
                 if now - last_reconnect_attempt >= reconnect_interval:
                     last_reconnect_attempt = now
                     if self._try_connect():
-                        buffer = ""  # Clear buffer on reconnect
+                        buffer.clear()  # Clear buffer on reconnect
                         consecutive_errors = 0
-                        print("ESP32: Reconnected successfully")
+                        log.info("ESP32: Reconnected successfully")
                     else:
                         time.sleep(0.5)
                         continue
@@ -344,39 +371,44 @@ class ESP32SerialHandler:
                                 # No flush() - let it send naturally to avoid blocking
                                 last_screen_send = now
                                 self.last_tx_time = now
-                                print(f"ESP32: Sent SCREEN:{screen_idx} (async)")
+                                log.info(f"ESP32: Sent SCREEN:{screen_idx} (async)")
                         except Exception as e:
-                            print(f"ESP32 screen write error: {e}")
+                            log.warning(f"ESP32 screen write error: {e}")
                             consecutive_errors += 1
                 
-                # Read incoming data
-                if self.serial_conn.in_waiting > 0:
-                    data = self.serial_conn.read(self.serial_conn.in_waiting)
-                    buffer += data.decode('utf-8', errors='ignore')
+                # Read incoming data - blocks in the kernel until at least one byte
+                # arrives (or READ_TIMEOUT passes), then takes whatever is buffered
+                want = min(self.serial_conn.in_waiting or 1, self.RX_CHUNK_BYTES)
+                n = self.serial_conn.readinto(rx_view[:want])
+                if n:
+                    buffer += rx_view[:n]
                     consecutive_errors = 0  # Reset on successful read
                     
                     # Process complete lines
-                    while '\n' in buffer:
-                        line, buffer = buffer.split('\n', 1)
-                        line = line.strip()
+                    idx = buffer.find(b'\n')
+                    while idx != -1:
+                        line = buffer[:idx].decode('utf-8', errors='ignore').strip()
+                        del buffer[:idx + 1]
                         if line:
                             self._process_line(line)
                             self.last_rx_time = time.time()
-                else:
-                    time.sleep(0.01)  # Small sleep to prevent busy-waiting
+                        idx = buffer.find(b'\n')
+                    
+                    if len(buffer) > self.MAX_LINE_BYTES:
+                        buffer.clear()
                 
                 # Check for stale connection (no data for 10+ seconds when we expect data)
                 if time.time() - self.last_rx_time > 10.0 and self.last_rx_time > 0:
                     consecutive_errors += 1
                     
             except serial.SerialException as e:
-                print(f"ESP32 serial error (will reconnect): {e}")
+                log.warning(f"ESP32 serial error (will reconnect): {e}")
                 self.connected = False
                 consecutive_errors += 1
                 time.sleep(0.5)
             except OSError as e:
                 # Device disconnected (common when ESP32 restarts)
-                print(f"ESP32 disconnected (will reconnect): {e}")
+                log.warning(f"ESP32 disconnected (will reconnect): {e}")
                 self.connected = False
                 if self.serial_conn:
                     try:
@@ -387,13 +419,13 @@ class ESP32SerialHandler:
                 consecutive_errors = 0  # Expected during restart
                 time.sleep(0.5)
             except Exception as e:
-                print(f"ESP32 serial read error: {e}")
+                log.warning(f"ESP32 serial read error: {e}")
                 consecutive_errors += 1
                 time.sleep(0.1)
             
             # If too many consecutive errors, force reconnect
             if consecutive_errors > 10:
-                print("ESP32: Too many errors, forcing reconnect...")
+                log.warning("ESP32: Too many errors, forcing reconnect...")
                 self.connected = False
                 if self.serial_conn:
                     try:
@@ -406,40 +438,12 @@ class ESP32SerialHandler:
     def _process_line(self, line: str):
         """Process a complete line from ESP32"""
         try:
-            if line.startswith("TPMS:"):
-                self._parse_tpms(line[5:])
-            elif line.startswith("TPMS_PSI:"):
-                # BLE TPMS pressure data: TPMS_PSI:FL,FR,RL,RR
-                self._parse_tpms_psi(line[9:])
-            elif line.startswith("TPMS_TEMP:"):
-                # BLE TPMS temperature data: TPMS_TEMP:FL,FR,RL,RR
-                self._parse_tpms_temp(line[10:])
-            elif line.startswith("IMU:"):
-                self._parse_imu(line[4:])
-            elif line.startswith("SCREEN_CHANGED:"):
-                # ESP32 user changed screen via touch - sync Pi display
-                try:
-                    new_screen = int(line[15:])
-                    self.esp32_screen = new_screen
-                    print(f"ESP32: Screen changed to {new_screen} via touch")
-                    if self.on_screen_change:
-                        self.on_screen_change(new_screen)
-                except ValueError:
-                    pass
-            elif line.startswith("SETTING:"):
-                # Single setting changed on ESP32 - sync to Pi
-                self._parse_setting(line[8:])
-            elif line.startswith("SELECTION:"):
-                # Settings selection changed on ESP32 - sync to Pi
-                try:
-                    selection = int(line[10:])
-                    if self.on_selection_change:
-                        self.on_selection_change(selection)
-                except ValueError:
-                    pass
-            elif line.startswith("SETTINGS:"):
-                # All settings from ESP32 - full sync
-                self._parse_all_settings(line[9:])
+            # Data frames are TAG:payload - one partition + dict lookup instead
+            # of walking a startswith() chain for every line
+            tag, sep, payload = line.partition(':')
+            handler = self._frame_handlers.get(tag) if sep else None
+            if handler:
+                handler(payload)
             elif line.startswith("OK:SCREEN_"):
                 # Screen change acknowledgement
                 try:
@@ -448,7 +452,7 @@ class ESP32SerialHandler:
                     pass
             elif line.startswith("OK:SET:"):
                 # Setting change acknowledgement
-                print(f"ESP32: Setting confirmed - {line[7:]}")
+                log.info(f"ESP32: Setting confirmed - {line[7:]}")
             elif line.startswith("OK:"):
                 # Other acknowledgements (SCREEN_NEXT, SCREEN_PREV, etc.)
                 pass
@@ -456,39 +460,59 @@ class ESP32SerialHandler:
                 # Ignore touch debug messages
                 pass
             elif line.startswith("PERF:"):
-                # Performance monitoring from ESP32 - always print for debugging
-                print(f"ESP32 {line}")
+                # Performance monitoring from ESP32 - always log for debugging
+                log.info(f"ESP32 {line}")
             else:
                 # Log unknown messages for debugging
-                print(f"ESP32: {line}")
+                log.info(f"ESP32: {line}")
         except Exception as e:
-            print(f"Error parsing ESP32 data '{line}': {e}")
+            log.warning(f"Error parsing ESP32 data '{line}': {e}")
+    
+    def _parse_screen_changed(self, data: str):
+        """ESP32 user changed screen via touch - sync Pi display"""
+        try:
+            new_screen = int(data)
+        except ValueError:
+            return
+        self.esp32_screen = new_screen
+        log.info(f"ESP32: Screen changed to {new_screen} via touch")
+        if self.on_screen_change:
+            self.on_screen_change(new_screen)
+    
+    def _parse_selection(self, data: str):
+        """Settings selection changed on ESP32 - sync to Pi"""
+        try:
+            selection = int(data)
+        except ValueError:
+            return
+        if self.on_selection_change:
+            self.on_selection_change(selection)
     
     def _parse_setting(self, data: str):
         """Parse a single setting from ESP32: name=value"""
-        if '=' not in data:
+        name, sep, value = data.partition('=')
+        if not sep:
             return
-        name, value = data.split('=', 1)
         name = name.strip()
         value = value.strip()
         
         # Call the callback if registered
         if self.on_setting_change:
             self.on_setting_change(name, value)
-        print(f"ESP32: Setting changed - {name}={value}")
+        log.info(f"ESP32: Setting changed - {name}={value}")
     
     def _parse_all_settings(self, data: str):
         """Parse all settings from ESP32: name1=val1,name2=val2,..."""
         settings_dict = {}
         for pair in data.split(','):
-            if '=' in pair:
-                name, value = pair.split('=', 1)
+            name, sep, value = pair.partition('=')
+            if sep:
                 settings_dict[name.strip()] = value.strip()
         
         # Call callback with all settings
         if self.on_settings_sync:
             self.on_settings_sync(settings_dict)
-        print(f"ESP32: Full settings sync - {len(settings_dict)} settings received")
+        log.info(f"ESP32: Full settings sync - {len(settings_dict)} settings received")
     
     def _parse_tpms(self, data: str):
         """Parse TPMS data: sensor_num,psi,temp_c,battery"""
@@ -528,7 +552,7 @@ class ESP32SerialHandler:
             if updated_tires:
                 self.tpms_last_update = time.time()
                 self._save_tpms_cache(updated_tires)  # Persist with per-tire timestamps
-            print(f"TPMS BLE PSI: {self.telemetry.tire_pressure}")
+            log.info(f"TPMS BLE PSI: {self.telemetry.tire_pressure}")
     
     def _parse_tpms_temp(self, data: str):
         """Parse BLE TPMS temperature data: FL,FR,RL,RR (all in Fahrenheit)"""
@@ -548,7 +572,7 @@ class ESP32SerialHandler:
             if updated_tires:
                 self.tpms_last_update = time.time()
                 self._save_tpms_cache(updated_tires)  # Persist with per-tire timestamps
-            print(f"TPMS BLE Temp: {self.telemetry.tire_temp}")
+            log.info(f"TPMS BLE Temp: {self.telemetry.tire_temp}")
     
     def _parse_imu(self, data: str):
         """Parse IMU data: accelX,accelY,accelZ,gyroX,gyroY,gyroZ,linearX,linearY,pitch,roll"""
@@ -629,32 +653,28 @@ class ESP32SerialHandler:
                     self._mpg_debug_counter = 0
                     print(f"[ESP32 TX] fuel={fuel_pct:.1f}%, tel.avg_mpg={self.telemetry.average_mpg:.1f}, tel.range={self.telemetry.range_miles}, sending: mpg={avg_mpg:.1f}, range={range_miles}")
                 
-                self.serial_conn.write(msg.encode('utf-8'))
-                
                 # Send diagnostics (less frequently important)
                 diag_msg = f"DIAG:{int(self.telemetry.check_engine_light)},{int(self.telemetry.abs_warning)},"
                 # Oil warning is the INVERSE of oil_status (True = OK, False = WARNING)
                 oil_warning = not self.telemetry.oil_status
                 diag_msg += f"{int(oil_warning)},{int(self.telemetry.battery_warning)},"
                 diag_msg += f"{int(self.telemetry.headlights_on)},{int(self.telemetry.high_beams_on)}\n"
-                self.serial_conn.write(diag_msg.encode('utf-8'))
                 
                 # Send tire pressure data from cache (FL, FR, RL, RR)
                 tire_msg = f"TIRE:{self.telemetry.tire_pressure[0]:.1f},{self.telemetry.tire_pressure[1]:.1f},"
                 tire_msg += f"{self.telemetry.tire_pressure[2]:.1f},{self.telemetry.tire_pressure[3]:.1f}\n"
-                self.serial_conn.write(tire_msg.encode('utf-8'))
                 
                 # Send tire temperature data from cache (FL, FR, RL, RR in Fahrenheit)
                 tire_temp_msg = f"TIRE_TEMP:{self.telemetry.tire_temp[0]:.1f},{self.telemetry.tire_temp[1]:.1f},"
                 tire_temp_msg += f"{self.telemetry.tire_temp[2]:.1f},{self.telemetry.tire_temp[3]:.1f}\n"
-                self.serial_conn.write(tire_temp_msg.encode('utf-8'))
                 
                 # Send tire timestamps (HH:MM:SS per tire)
                 tire_time_msg = f"TIRE_TIME:{self.tpms_last_update_str[0]},{self.tpms_last_update_str[1]},"
                 tire_time_msg += f"{self.tpms_last_update_str[2]},{self.tpms_last_update_str[3]}\n"
-                self.serial_conn.write(tire_time_msg.encode('utf-8'))
                 
-                # Flush all at once
+                # All five frames go out in a single write, then flush
+                frames = (msg, diag_msg, tire_msg, tire_temp_msg, tire_time_msg)
+                self.serial_conn.write("".join(frames).encode('utf-8'))
                 self.serial_conn.flush()
                 self.last_tx_time = time.time()
             
@@ -43,8 +43,9 @@ import sys
 import os
 import time
 import argparse
+from collections import namedtuple
 from enum import Enum, auto
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import List, Tuple, Optional
 
 # Try to import numpy for sound generation
@@ -240,7 +241,7 @@ LED_SEQUENCE_NAMES = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class Settings:
     brightness: int = 80
     volume: int = 70  # Sound effects volume (0-100)
@@ -253,6 +254,28 @@ class Settings:
     demo_mode: bool = False  # False = use real CAN data, True = simulated data
     led_sequence: int = LED_SEQ_CENTER_OUT  # LED sequence mode (1-4)
     clutch_display_mode: int = 0  # 0=Gear#(colored), 1='C', 2='S', 3='-'
+    # Internal bookkeeping (not settings)
+    _version: int = field(default=0, init=False, repr=False, compare=False)
+    _snapshot: tuple = field(default=(-1, None), init=False, repr=False, compare=False)
+    
+    def __setattr__(self, name, value):
+        # Bump a version counter on every change so consumers (web remote
+        # status cache) can tell cheaply whether anything changed
+        object.__setattr__(self, name, value)
+        if not name.startswith('_'):
+            object.__setattr__(self, '_version', getattr(self, '_version', 0) + 1)
+    
+    def snapshot(self) -> 'SettingsSnapshot':
+        """Immutable copy of all settings, rebuilt only after a change"""
+        version, snap = self._snapshot
+        if version != self._version:
+            snap = SettingsSnapshot(*(getattr(self, name) for name in SettingsSnapshot._fields))
+            self._snapshot = (self._version, snap)
+        return snap
+
+
+SettingsSnapshot = namedtuple(
+    'SettingsSnapshot', [f.name for f in fields(Settings) if not f.name.startswith('_')])
 
 
 # =============================================================================
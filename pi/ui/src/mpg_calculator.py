@@ -24,12 +24,15 @@ DATA SAFETY:
 - Never overwrites good data with empty data (checks file on disk first)
 - Startup fuel guard ignores fuel readings until CAN data stabilizes
 - File locking prevents multi-instance corruption
+- Periodic saves run on a single background I/O thread so fsync never
+  stalls the render loop
 """
 
 import json
 import os
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Optional, List
 from pathlib import Path
@@ -138,6 +141,10 @@ class MPGCalculator:
         # Running flag
         self._running = False
         
+        # Background disk writer (one worker keeps saves ordered)
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        self._reload_requested = False  # Set by the writer when disk has newer data
+        
         # Debug tracking
         self._debug_counter = 0
     
@@ -148,12 +155,16 @@ class MPGCalculator:
         self._fuel_stabilized = False
         self._valid_fuel_readings = 0
         self._load_data()
+        self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='mpg-io')
         print(f"MPG Calculator started. Lifetime: {self._lifetime_miles:.1f} mi, "
               f"{self._lifetime_gallons:.2f} gal, avg MPG: {self._average_mpg:.1f}")
     
     def stop(self):
         """Stop the calculator and save data"""
         self._running = False
+        if self._io_pool:
+            self._io_pool.shutdown(wait=True)  # Let any queued save finish first
+            self._io_pool = None
         self._save_data()
         print("MPG Calculator stopped and data saved.")
     
@@ -205,6 +216,12 @@ class MPGCalculator:
         if not self._running:
             return
         
+        # The background writer found more miles on disk - adopt them here so
+        # state is only ever mutated on the caller's thread
+        if self._reload_requested:
+            self._reload_requested = False
+            self._load_data()
+        
         current_time = time.time()
         
         # Calculate dt if not provided
@@ -482,7 +499,30 @@ class MPGCalculator:
             print("MPG: No existing data file, starting fresh")
     
     def _save_data(self):
-        """Save persistent data using atomic write with backup.
+        """Snapshot persistent data and write it to disk.
+        
+        While running, the write is handed to the background I/O thread;
+        after stop() it happens synchronously.
+        """
+        data = {
+            'total_miles': self._lifetime_miles,
+            'total_gallons': self._lifetime_gallons,
+            'recent_mpg_values': list(self._recent_mpg_values),
+            'recent_distances': list(self._recent_distances),
+            'fuel_at_milestone': self._fuel_at_milestone,
+            'session_distance': self._session_distance,
+            'last_fuel_pct': self._last_fuel_pct,
+            'last_save_time': time.time(),
+            'calculated_avg_mpg': self._average_mpg,
+            '_comment': 'MPG data for MX5 Telemetry. Uses milestone-based tracking.'
+        }
+        if self._io_pool:
+            self._io_pool.submit(self._write_data, data)
+        else:
+            self._write_data(data)
+    
+    def _write_data(self, data: dict):
+        """Write a data snapshot using atomic write with backup.
         
         Safety measures:
         1. Check if file on disk has MORE miles than us — if so, don't overwrite
@@ -503,28 +543,15 @@ class MPGCalculator:
                     existing_miles = existing.get('total_miles', 0)
                     # If the file on disk has significantly more miles, something is wrong
                     # with our instance — refuse to overwrite
-                    if existing_miles > self._lifetime_miles + 5.0:
-                        # Reload from disk instead of overwriting
-                        print(f"MPG: SAFETY — disk has {existing_miles:.1f}mi vs our {self._lifetime_miles:.1f}mi. "
+                    if existing_miles > data['total_miles'] + 5.0:
+                        # Reload from disk (on the next update) instead of overwriting
+                        print(f"MPG: SAFETY — disk has {existing_miles:.1f}mi vs our {data['total_miles']:.1f}mi. "
                               f"Reloading from disk to prevent data loss.")
-                        self._load_data()
+                        self._reload_requested = True
                         return
                 except (json.JSONDecodeError, OSError):
                     pass  # File is corrupt, safe to overwrite
             
-            data = {
-                'total_miles': self._lifetime_miles,
-                'total_gallons': self._lifetime_gallons,
-                'recent_mpg_values': self._recent_mpg_values,
-                'recent_distances': self._recent_distances,
-                'fuel_at_milestone': self._fuel_at_milestone,
-                'session_distance': self._session_distance,
-                'last_fuel_pct': self._last_fuel_pct,
-                'last_save_time': time.time(),
-                'calculated_avg_mpg': self._average_mpg,
-                '_comment': 'MPG data for MX5 Telemetry. Uses milestone-based tracking.'
-            }
-            
             # Step 1: Back up current file (if it exists and has data)
             if self.data_file.exists() and self.data_file.stat().st_size > 10:
                 try:
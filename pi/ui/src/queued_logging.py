@@ -0,0 +1,40 @@
+"""
+Non-blocking logging for background threads
+
+print() takes the stdout lock and blocks on the pipe (journald when the
+display runs as a service), which stalls Socket.IO handlers and serial
+read loops. Loggers from get_logger() put records on a queue instead; one
+listener thread does the actual writing.
+
+Usage:
+    from queued_logging import get_logger
+    log = get_logger('mx5.web')
+    log.info("Web remote client connected")
+"""
+
+import atexit
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+_queue = queue.SimpleQueue()
+_listener = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Get a logger whose output is written by the shared listener thread"""
+    global _listener
+    if _listener is None:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))  # Same output as print()
+        _listener = QueueListener(_queue, handler)
+        _listener.start()
+        atexit.register(_listener.stop)  # Flush queued records on exit
+    
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        logger.addHandler(QueueHandler(_queue))
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
@@ -23,6 +23,7 @@ Navigation Lock:
 
 from enum import Enum, auto
 from dataclasses import dataclass
+import queue
 import time
 
 # CAN IDs for steering wheel controls (MS-CAN 125kbps)
@@ -89,6 +90,7 @@ class SWCHandler:
         self.debounce_time = 0
         self._pending_buttons = []  # Thread-safe queue for button events
         self._callbacks = []
+        self._queues: tuple = ()  # Event queues fed directly via put_nowait
         
         # Navigation lock state
         self.nav_locked = False  # When True, ignore all button presses
@@ -261,6 +263,19 @@ class SWCHandler:
         """Add a callback function for button events"""
         self._callbacks.append(callback)
     
+    def register_queue(self, q: queue.Queue):
+        """Forward button events straight into a queue (e.g. a UI event loop)
+        
+        Cheaper than registering a callback that only does q.put() since
+        put_nowait is called directly without an extra Python frame.
+        """
+        if q not in self._queues:
+            self._queues = self._queues + (q,)
+    
+    def unregister_queue(self, q: queue.Queue):
+        """Stop forwarding button events to a queue"""
+        self._queues = tuple(existing for existing in self._queues if existing is not q)
+    
     def add_lock_callback(self, callback):
         """Add a callback function for lock state changes
         
@@ -293,3 +308,8 @@ class SWCHandler:
                 callback(button)
             except Exception as e:
                 print(f"Error in button callback: {e}")
+        for q in self._queues:
+            try:
+                q.put_nowait(button)
+            except queue.Full:
+                print(f"Button queue full, dropped {BUTTON_NAMES.get(button, button)}")
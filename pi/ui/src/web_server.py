@@ -14,16 +14,87 @@ Features:
     - Settings control (demo mode, etc.)
     - Real-time sync via WebSocket
     - Mobile-optimized UI
+
+Client flow:
+    The 'status' WebSocket event carries the same full payload as GET
+    /api/status (sent on connect and on 'request_status'), and later changes
+    arrive as 'state_delta' events. Clients only need to poll /api/status
+    until the socket is up - once the first 'status' event arrives, stop.
 """
 
+import os
+import sys
 import threading
-from flask import Flask, render_template, jsonify, request
-from flask_socketio import SocketIO, emit
+
+
+# Socket.IO server mode. The default threading server is the only one that
+# accepts emits from the display, timer and sync OS threads. Set
+# MX5_WEB_ASYNC_MODE=eventlet (or gevent) to opt in to an event-loop server.
+ASYNC_MODE = os.environ.get('MX5_WEB_ASYNC_MODE', 'threading')
+
+if ASYNC_MODE == 'eventlet':
+    # Cooperative sockets/select/time so Socket.IO sends don't stall the hub.
+    # Threads are left unpatched - the display loop and serial readers are
+    # real OS threads.
+    import eventlet
+    eventlet.monkey_patch(thread=False)
+
+from typing import Callable, NamedTuple, Optional
+from flask import Flask, render_template, jsonify, request, Response
+from flask_socketio import SocketIO, emit, join_room, leave_room
 import time
 
+from queued_logging import get_logger
+
+log = get_logger('mx5.web')
+
+# Try to import orjson for faster JSON serialization (optional)
+try:
+    import orjson
+    from flask.json.provider import DefaultJSONProvider
+    ORJSON_AVAILABLE = True
+    
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+    
+    class OrjsonProvider(DefaultJSONProvider):
+        """Flask JSON provider backed by orjson (used by jsonify and request.json)"""
+        
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, default=self.default).decode('utf-8')
+        
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+except ImportError:
+    import json
+    ORJSON_AVAILABLE = False
+    
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def _to_bool(value) -> bool:
+    """Parse a toggle value sent by the web UI ('1'/'0' or JSON bool)"""
+    return value == '1' or value == True
+
+
+class _Setting(NamedTuple):
+    """How to apply one /api/settings/update name"""
+    attr: str                                # Attribute on display_app.settings
+    coerce: Callable                         # Converts the raw request value
+    side_effect: Optional[Callable] = None   # Called as side_effect(display_app, value)
+
 class WebRemoteServer:
     """Web-based remote control for MX5 display system"""
     
+    # Screen/setting notifications are coalesced into one 'state_delta' emit
+    DELTA_WINDOW_S = 0.03     # Collect updates for 30ms before emitting
+    DELTA_MAX_SETTINGS = 16   # Flush early once this many settings are pending
+    BATCH_MAX_REQUESTS = 32   # Max sub-requests accepted by /api/batch
+    
+    # Socket.IO rooms clients can subscribe to (all clients join both on connect)
+    TOPICS = ('screen', 'settings')
+    
     def __init__(self, display_app):
         """
         Args:
@@ -33,12 +104,52 @@ class WebRemoteServer:
                         static_folder='../static',
                         template_folder='../templates')
         self.app.config['SECRET_KEY'] = 'mx5-telemetry-2026'
-        self.socketio = SocketIO(self.app, cors_allowed_origins="*")
+        if ORJSON_AVAILABLE:
+            self.app.json = OrjsonProvider(self.app)
+        self.app.json.compact = True  # Never pretty-print API responses
+        self.socketio = SocketIO(self.app, cors_allowed_origins="*", async_mode=ASYNC_MODE)
         self.display_app = display_app
+        # Screen names never change at runtime - freeze them once
+        self._screen_names = tuple(sys.intern(name) for name in display_app.screen_names)
         
         self._running = False
         self._thread = None
         
+        # Rendered index.html (the page is static, so render it only once)
+        self._index_html = None
+        
+        # Status payload and its JSON, keyed by (settings version, screen, sleeping, lock)
+        self._status_cache = (None, None, b'')
+        
+        # Pending state_delta payload (merged under lock, flushed by timer)
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._flush_timer = None
+        
+        # ESP32/Arduino syncs queued by request handlers and run on a worker
+        # thread. Dict used as an ordered set so repeats collapse into one call.
+        self._sync_pending = {}
+        self._sync_lock = threading.Lock()
+        self._sync_event = threading.Event()
+        self._sync_thread = None
+        
+        # /api/settings/update dispatch table: request name -> _Setting
+        self._setting_handlers = {
+            'demo_mode': _Setting('demo_mode', _to_bool,
+                                  # Reinitialize data sources if demo mode changed
+                                  lambda app, v: app._init_data_sources()),
+            'brightness': _Setting('brightness', int),
+            'volume': _Setting('volume', int, lambda app, v: app.sound.set_volume(v)),
+            'shift_rpm': _Setting('shift_rpm', int),
+            'redline_rpm': _Setting('redline_rpm', int),
+            'use_mph': _Setting('use_mph', _to_bool),
+            'tire_low_psi': _Setting('tire_low_psi', float),
+            'tire_high_psi': _Setting('tire_high_psi', float),
+            'coolant_warn': _Setting('coolant_warn_f', int),
+            'led_sequence': _Setting('led_sequence', int, self._queue_led_sequence_sync),
+            'clutch_display_mode': _Setting('clutch_display_mode', int),
+        }
+        
         # Setup routes
         self._setup_routes()
         self._setup_socketio()
@@ -48,58 +159,38 @@ class WebRemoteServer:
         
         @self.app.route('/')
         def index():
-            """Serve main remote control page"""
-            return render_template('index.html')
+            """Serve main remote control page (rendered once, then served from memory)"""
+            if self._index_html is None:
+                self._index_html = render_template('index.html').encode('utf-8')
+            return Response(self._index_html, mimetype='text/html')
+        
+        @self.app.route('/api/reload_ui', methods=['POST'])
+        def reload_ui():
+            """Drop the cached index page so template edits show up (development)"""
+            self._index_html = None
+            return jsonify({'success': True})
         
         @self.app.route('/api/status')
         def get_status():
             """Get current system status"""
-            return jsonify({
-                'screen': self.display_app.current_screen,
-                'screen_name': self.display_app.screen_names[self.display_app.current_screen],
-                'demo_mode': self.display_app.settings.demo_mode,
-                'sleeping': self.display_app.sleeping,
-                'nav_locked': self.display_app.swc_handler.nav_locked if self.display_app.swc_handler else False,
-                'settings': {
-                    'demo_mode': self.display_app.settings.demo_mode,
-                    'brightness': self.display_app.settings.brightness,
-                    'volume': self.display_app.settings.volume,
-                    'shift_rpm': self.display_app.settings.shift_rpm,
-                    'redline_rpm': self.display_app.settings.redline_rpm,
-                    'use_mph': self.display_app.settings.use_mph,
-                    'tire_low_psi': self.display_app.settings.tire_low_psi,
-                    'tire_high_psi': self.display_app.settings.tire_high_psi,
-                    'coolant_warn_f': self.display_app.settings.coolant_warn_f,
-                    'led_sequence': self.display_app.settings.led_sequence,
-                    'clutch_display_mode': self.display_app.settings.clutch_display_mode
-                }
-            })
+            return self._json_response(self._status_json())
         
         @self.app.route('/api/screen/<int:screen_num>', methods=['POST'])
         def change_screen(screen_num):
             """Change to specific screen"""
             if 0 <= screen_num < 8:
-                self.display_app.change_screen(screen_num)
-                # Notify all connected clients
-                self.socketio.emit('screen_changed', {'screen': screen_num})
-                return jsonify({'success': True, 'screen': screen_num})
+                return self._goto_screen(screen_num)
             return jsonify({'success': False, 'error': 'Invalid screen number'}), 400
         
         @self.app.route('/api/screen/next', methods=['POST'])
         def next_screen():
             """Go to next screen"""
-            new_screen = (self.display_app.current_screen + 1) % 8
-            self.display_app.change_screen(new_screen)
-            self.socketio.emit('screen_changed', {'screen': new_screen})
-            return jsonify({'success': True, 'screen': new_screen})
+            return self._goto_screen((self._screen_index() + 1) % 8)
         
         @self.app.route('/api/screen/prev', methods=['POST'])
         def prev_screen():
             """Go to previous screen"""
-            new_screen = (self.display_app.current_screen - 1) % 8
-            self.display_app.change_screen(new_screen)
-            self.socketio.emit('screen_changed', {'screen': new_screen})
-            return jsonify({'success': True, 'screen': new_screen})
+            return self._goto_screen((self._screen_index() - 1) % 8)
         
         @self.app.route('/api/settings/update', methods=['POST'])
         def update_setting():
@@ -111,50 +202,65 @@ class WebRemoteServer:
             if not name:
                 return jsonify({'success': False, 'error': 'Missing setting name'}), 400
             
+            handler = self._setting_handlers.get(name)
+            if handler is None:
+                return jsonify({'success': False, 'error': 'Unknown setting'}), 400
+            
             try:
-                # Handle each setting type appropriately
-                if name == 'demo_mode':
-                    self.display_app.settings.demo_mode = (value == '1' or value == True)
-                    # Reinitialize data sources if demo mode changed
-                    self.display_app._init_data_sources()
-                elif name == 'brightness':
-                    self.display_app.settings.brightness = int(value)
-                elif name == 'volume':
-                    self.display_app.settings.volume = int(value)
-                    self.display_app.sound.set_volume(self.display_app.settings.volume)
-                elif name == 'shift_rpm':
-                    self.display_app.settings.shift_rpm = int(value)
-                elif name == 'redline_rpm':
-                    self.display_app.settings.redline_rpm = int(value)
-                elif name == 'use_mph':
-                    self.display_app.settings.use_mph = (value == '1' or value == True)
-                elif name == 'tire_low_psi':
-                    self.display_app.settings.tire_low_psi = float(value)
-                elif name == 'tire_high_psi':
-                    self.display_app.settings.tire_high_psi = float(value)
-                elif name == 'coolant_warn':
-                    self.display_app.settings.coolant_warn_f = int(value)
-                elif name == 'led_sequence':
-                    self.display_app.settings.led_sequence = int(value)
-                    # Send LED sequence change to Arduino using the app's method
-                    if hasattr(self.display_app, '_send_led_sequence_to_arduino'):
-                        self.display_app._send_led_sequence_to_arduino()
-                elif name == 'clutch_display_mode':
-                    self.display_app.settings.clutch_display_mode = int(value)
-                else:
-                    return jsonify({'success': False, 'error': 'Unknown setting'}), 400
+                new_value = handler.coerce(value)
+                # Nothing to apply, sync or broadcast if the value is unchanged
+                if getattr(self.display_app.settings, handler.attr) == new_value:
+                    return jsonify({'success': True, 'name': name, 'value': value, 'noop': True})
+                setattr(self.display_app.settings, handler.attr, new_value)
+                if handler.side_effect:
+                    handler.side_effect(self.display_app, new_value)
                 
-                # Sync to ESP32 if available
+                # Sync to ESP32 if available (off the request path)
                 if self.display_app.esp32_handler:
-                    self.display_app._sync_settings_to_esp32()
+                    self._queue_sync(self.display_app._sync_settings_to_esp32)
                 
-                # Notify all clients
-                self.socketio.emit('setting_changed', {name: value})
+                # Notify all clients (under the same key /api/status uses)
+                self.notify_setting_change(handler.attr, new_value)
                 return jsonify({'success': True, 'name': name, 'value': value})
                 
             except Exception as e:
                 return jsonify({'success': False, 'error': str(e)}), 500
         
+        @self.app.route('/api/batch', methods=['POST'])
+        def batch():
+            """Run several API calls in one round trip
+            
+            Body: [{"path": "/api/status"},
+                   {"path": "/api/settings/update", "method": "POST", "body": {...}}]
+            Returns [{"path", "status", "body"}, ...] in request order.
+            """
+            entries = request.get_json(silent=True)
+            if not isinstance(entries, list):
+                return jsonify({'success': False, 'error': 'Expected a JSON array'}), 400
+            if len(entries) > self.BATCH_MAX_REQUESTS:
+                return jsonify({'success': False, 'error': 'Too many requests in batch'}), 400
+            
+            results = []
+            for entry in entries:
+                path = entry.get('path') if isinstance(entry, dict) else None
+                try:
+                    # A malformed entry only fails its own slot - earlier
+                    # sub-requests have already run and must be reported
+                    if (not isinstance(path, str) or not path.startswith('/api/')
+                            or path == '/api/batch'):
+                        results.append({'path': path, 'status': 400,
+                                        'body': {'success': False, 'error': 'Invalid path'}})
+                        continue
+                    with self.app.test_request_context(path, method=entry.get('method', 'GET'),
+                                                       json=entry.get('body')):
+                        rv = self.app.full_dispatch_request()
+                    results.append({'path': path, 'status': rv.status_code,
+                                    'body': rv.get_json(silent=True)})
+                except Exception as e:
+                    results.append({'path': path, 'status': 500,
+                                    'body': {'success': False, 'error': str(e)}})
+            return self._json_response(_dumps(results))
+        
         @self.app.route('/api/wake', methods=['POST'])
         def wake_display():
             """Wake display from sleep"""
@@ -181,38 +287,172 @@ class WebRemoteServer:
         
         @self.socketio.on('connect')
         def handle_connect():
-            """Client connected - send current status"""
-            print("Web remote client connected")
-            emit('status', {
-                'screen': self.display_app.current_screen,
-                'screen_name': self.display_app.screen_names[self.display_app.current_screen],
-                'demo_mode': self.display_app.settings.demo_mode
-            })
+            """Client connected - subscribe to all topics and send current status"""
+            log.info("Web remote client connected")
+            for topic in self.TOPICS:
+                join_room(topic)
+            emit('status', self._cached_status()[0])
         
         @self.socketio.on('disconnect')
         def handle_disconnect():
             """Client disconnected"""
-            print("Web remote client disconnected")
+            log.info("Web remote client disconnected")
+        
+        @self.socketio.on('subscribe')
+        def handle_subscribe(topics):
+            """Join topic rooms ('screen', 'settings') - accepts a name or a list"""
+            for topic in self._valid_topics(topics):
+                join_room(topic)
+        
+        @self.socketio.on('unsubscribe')
+        def handle_unsubscribe(topics):
+            """Leave topic rooms, e.g. a background tab dropping 'settings'"""
+            for topic in self._valid_topics(topics):
+                leave_room(topic)
         
         @self.socketio.on('request_status')
         def handle_status_request():
             """Client requesting status update"""
-            emit('status', {
-                'screen': self.display_app.current_screen,
-                'screen_name': self.display_app.screen_names[self.display_app.current_screen],
-                'demo_mode': self.display_app.settings.demo_mode
-            })
+            emit('status', self._cached_status()[0])
+    
+    def _json_response(self, body: bytes):
+        """Wrap pre-serialized JSON in a response (live state - never cached by the browser)"""
+        return Response(body, mimetype='application/json', headers={
+            'Content-Length': str(len(body)),
+            'Cache-Control': 'no-store'
+        })
+    
+    def _goto_screen(self, screen_num):
+        """Switch screens and notify clients - skipped if already on that screen"""
+        if screen_num == self._screen_index():
+            return jsonify({'success': True, 'screen': screen_num, 'noop': True})
+        self.display_app.change_screen(screen_num)
+        # Notify all connected clients
+        self.notify_screen_change(screen_num)
+        return jsonify({'success': True, 'screen': screen_num})
+    
+    def _valid_topics(self, topics):
+        """Filter a subscribe/unsubscribe request down to known topic names"""
+        if isinstance(topics, str):
+            topics = [topics]
+        if not isinstance(topics, (list, tuple)):
+            return []
+        return [topic for topic in topics if topic in self.TOPICS]
+    
+    def _screen_index(self):
+        """Current screen as an int (display app may hold a Screen enum)"""
+        screen = self.display_app.current_screen
+        return getattr(screen, 'value', screen)
+    
+    def _build_status(self):
+        """Build the full status payload"""
+        app = self.display_app
+        settings = app.settings.snapshot()
+        screen = self._screen_index()
+        return {
+            'screen': screen,
+            'screen_name': self._screen_names[screen],
+            'demo_mode': settings.demo_mode,
+            'sleeping': app.sleeping,
+            'nav_locked': app.swc_handler.nav_locked if app.swc_handler else False,
+            'settings': {
+                'demo_mode': settings.demo_mode,
+                'brightness': settings.brightness,
+                'volume': settings.volume,
+                'shift_rpm': settings.shift_rpm,
+                'redline_rpm': settings.redline_rpm,
+                'use_mph': settings.use_mph,
+                'tire_low_psi': settings.tire_low_psi,
+                'tire_high_psi': settings.tire_high_psi,
+                'coolant_warn_f': settings.coolant_warn_f,
+                'led_sequence': settings.led_sequence,
+                'clutch_display_mode': settings.clutch_display_mode
+            }
+        }
+    
+    def _cached_status(self):
+        """(status dict, status JSON) - rebuilt only when something changed"""
+        app = self.display_app
+        key = (
+            getattr(app.settings, '_version', None),
+            self._screen_index(),
+            app.sleeping,
+            app.swc_handler.nav_locked if app.swc_handler else False,
+        )
+        cached_key, status, status_json = self._status_cache
+        if key[0] is None or key != cached_key:
+            status = self._build_status()
+            status_json = _dumps(status)
+            self._status_cache = (key, status, status_json)
+        return status, status_json
+    
+    def _status_json(self) -> bytes:
+        """Serialized status payload"""
+        return self._cached_status()[1]
     
     def notify_screen_change(self, screen_num):
         """Notify all connected clients of screen change"""
-        self.socketio.emit('screen_changed', {
-            'screen': screen_num,
-            'screen_name': self.display_app.screen_names[screen_num]
-        })
+        self._queue_delta(screen=screen_num)
     
     def notify_setting_change(self, setting_name, value):
         """Notify all connected clients of setting change"""
-        self.socketio.emit('setting_changed', {setting_name: value})
+        self._queue_delta(settings={setting_name: value})
+    
+    def _queue_delta(self, screen=None, settings=None):
+        """Merge an update into the pending state_delta and arm the flush timer"""
+        with self._pending_lock:
+            if screen is not None:
+                self._pending['screen'] = screen
+                self._pending['screen_name'] = self._screen_names[screen]
+            if settings:
+                self._pending.setdefault('settings', {}).update(settings)
+            flush_now = len(self._pending.get('settings', ())) >= self.DELTA_MAX_SETTINGS
+            if not flush_now and self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.DELTA_WINDOW_S, self._flush_delta)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        if flush_now:
+            self._flush_delta()
+    
+    def _flush_delta(self):
+        """Emit everything merged since the last flush as state_delta, per topic room"""
+        with self._pending_lock:
+            payload, self._pending = self._pending, {}
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        if 'screen' in payload:
+            self.socketio.emit('state_delta', {
+                'screen': payload['screen'],
+                'screen_name': payload['screen_name']
+            }, to='screen')
+        if 'settings' in payload:
+            self.socketio.emit('state_delta', {'settings': payload['settings']}, to='settings')
+    
+    def _queue_sync(self, op):
+        """Queue a device sync call for the worker thread (duplicates collapse)"""
+        with self._sync_lock:
+            self._sync_pending[op] = None
+        self._sync_event.set()
+    
+    def _queue_led_sequence_sync(self, app, value):
+        """Send the new LED sequence to the Arduino via the sync worker"""
+        if hasattr(app, '_send_led_sequence_to_arduino'):
+            self._queue_sync(app._send_led_sequence_to_arduino)
+    
+    def _sync_loop(self):
+        """Run queued ESP32/Arduino syncs so HTTP responses never wait on serial I/O"""
+        while self._running:
+            self._sync_event.wait()
+            with self._sync_lock:
+                ops = list(self._sync_pending)
+                self._sync_pending.clear()
+                self._sync_event.clear()
+            for op in ops:
+                try:
+                    op()
+                except Exception as e:
+                    log.error(f"Web remote sync error: {e}")
     
     def start(self, host='0.0.0.0', port=5000):
         """Start web server in background thread"""
@@ -226,14 +466,21 @@ class WebRemoteServer:
             daemon=True
         )
         self._thread.start()
-        print(f"Web remote control started at http://{host}:{port}")
+        self._sync_thread = threading.Thread(target=self._sync_loop, daemon=True)
+        self._sync_thread.start()
+        print(f"Web remote control started at http://{host}:{port} ({ASYNC_MODE})")
     
     def _run_server(self, host, port):
         """Run Flask server (called in background thread)"""
-        self.socketio.run(self.app, host=host, port=port, debug=False, use_reloader=False)
+        kwargs = {}
+        if ASYNC_MODE == 'threading':
+            # Werkzeug fallback - Flask-SocketIO refuses it outside a terminal otherwise
+            kwargs['allow_unsafe_werkzeug'] = True
+        self.socketio.run(self.app, host=host, port=port, debug=False, use_reloader=False, **kwargs)
     
     def stop(self):
         """Stop web server"""
         self._running = False
+        self._sync_event.set()  # Wake the sync worker so it can exit
         # Note: Flask/SocketIO doesn't have a clean shutdown method
         # The daemon thread will terminate when main program exits
@@ -14,7 +14,7 @@ function initSocket() {
     socket.on('connect', () => {
         console.log('Connected to MX5 display');
         updateConnectionStatus(true);
-        socket.emit('request_status');
+        // Server sends the full 'status' payload on connect - no polling needed
     });
     
     socket.on('disconnect', () => {
@@ -27,16 +27,15 @@ function initSocket() {
         updateUI(data);
     });
     
-    socket.on('screen_changed', (data) => {
-        console.log('Screen changed:', data);
-        currentScreen = data.screen;
-        updateCurrentScreen(data.screen);
-    });
-    
-    socket.on('setting_changed', (data) => {
-        console.log('Setting changed:', data);
-        if ('demo_mode' in data) {
-            document.getElementById('toggle-demo').checked = data.demo_mode;
+    // Screen and setting changes arrive batched: {screen?, screen_name?, settings?}
+    socket.on('state_delta', (data) => {
+        console.log('State delta:', data);
+        if ('screen' in data) {
+            currentScreen = data.screen;
+            updateCurrentScreen(data.screen);
+        }
+        if (data.settings) {
+            updateSettingsUI(data.settings);
         }
     });
 }
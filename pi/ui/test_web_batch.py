@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test Web Remote /api/batch - Local Development
+
+Runs batches against WebRemoteServer with a mock display app (no Pi hardware,
+no network) and checks that a malformed entry only fails its own result.
+
+Usage:
+    python test_web_batch.py
+"""
+
+import sys
+import os
+
+# Add src directory to path to import web_server
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from web_server import WebRemoteServer
+
+
+class MockDisplayApp:
+    def __init__(self):
+        self.current_screen = 0
+        self.screen_names = [
+            'OVERVIEW', 'RPM_SPEED', 'TPMS', 'ENGINE',
+            'GFORCE', 'DIAGNOSTICS', 'SYSTEM', 'SETTINGS'
+        ]
+        self.sleeping = False
+        self.swc_handler = None
+        self.esp32_handler = None
+
+    def change_screen(self, screen_index):
+        self.current_screen = screen_index
+
+
+def test_batch_malformed_entry():
+    """A bad entry mid-batch gets a 400 result; the others still run and report"""
+    display_app = MockDisplayApp()
+    client = WebRemoteServer(display_app).app.test_client()
+
+    rv = client.post('/api/batch', json=[
+        {'path': '/api/screen/next', 'method': 'POST'},
+        {'path': 5},
+        'not an object',
+        {'path': '/api/batch', 'method': 'POST'},
+        {'path': '/api/screen/next', 'method': 'POST'},
+    ])
+    assert rv.status_code == 200, rv.status_code
+    results = rv.get_json()
+
+    assert [r['status'] for r in results] == [200, 400, 400, 400, 200], results
+    assert results[0]['body'] == {'success': True, 'screen': 1}, results[0]
+    assert results[1]['body'] == {'success': False, 'error': 'Invalid path'}, results[1]
+    assert results[4]['body'] == {'success': True, 'screen': 2}, results[4]
+    assert display_app.current_screen == 2
+
+
+if __name__ == '__main__':
+    test_batch_malformed_entry()
+    print("✓ Malformed batch entry handled")
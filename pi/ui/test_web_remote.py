@@ -17,7 +17,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from flask import Flask, render_template, jsonify, request
-from flask_socketio import SocketIO, emit
+from flask_socketio import SocketIO, emit, join_room, leave_room
 import time
 import webbrowser
 import threading
@@ -63,6 +63,28 @@ socketio = SocketIO(app, cors_allowed_origins="*")
 # Create mock display app
 display_app = MockDisplayApp()
 
+# Socket.IO rooms clients can subscribe to (all clients join both on connect)
+TOPICS = ('screen', 'settings')
+
+def emit_screen_delta(screen_num):
+    """Broadcast a screen change the way the real server's state_delta does"""
+    socketio.emit('state_delta', {
+        'screen': screen_num,
+        'screen_name': display_app.screen_names[screen_num]
+    }, to='screen')
+
+def emit_settings_delta(settings):
+    """Broadcast setting changes the way the real server's state_delta does"""
+    socketio.emit('state_delta', {'settings': settings}, to='settings')
+
+def valid_topics(topics):
+    """Filter a subscribe/unsubscribe request down to known topic names"""
+    if isinstance(topics, str):
+        topics = [topics]
+    if not isinstance(topics, (list, tuple)):
+        return []
+    return [topic for topic in topics if topic in TOPICS]
+
 # Routes
 @app.route('/')
 def index():
@@ -85,10 +107,7 @@ def change_screen(screen_num):
     """Change to specific screen"""
     if display_app.change_screen(screen_num):
         # Notify all connected clients
-        socketio.emit('screen_changed', {
-            'screen': screen_num,
-            'screen_name': display_app.screen_names[screen_num]
-        })
+        emit_screen_delta(screen_num)
         return jsonify({'success': True, 'screen': screen_num})
     return jsonify({'success': False, 'error': 'Invalid screen number'}), 400
 
@@ -97,10 +116,7 @@ def next_screen():
     """Go to next screen"""
     new_screen = (display_app.current_screen + 1) % 8
     display_app.change_screen(new_screen)
-    socketio.emit('screen_changed', {
-        'screen': new_screen,
-        'screen_name': display_app.screen_names[new_screen]
-    })
+    emit_screen_delta(new_screen)
     return jsonify({'success': True, 'screen': new_screen})
 
 @app.route('/api/screen/prev', methods=['POST'])
@@ -108,10 +124,7 @@ def prev_screen():
     """Go to previous screen"""
     new_screen = (display_app.current_screen - 1) % 8
     display_app.change_screen(new_screen)
-    socketio.emit('screen_changed', {
-        'screen': new_screen,
-        'screen_name': display_app.screen_names[new_screen]
-    })
+    emit_screen_delta(new_screen)
     return jsonify({'success': True, 'screen': new_screen})
 
 @app.route('/api/settings/demo', methods=['POST'])
@@ -123,7 +136,7 @@ def toggle_demo():
     display_app.settings.save_settings()
     
     # Notify all clients
-    socketio.emit('setting_changed', {'demo_mode': enabled})
+    emit_settings_delta({'demo_mode': enabled})
     return jsonify({'success': True, 'demo_mode': enabled})
 
 @app.route('/api/wake', methods=['POST'])
@@ -137,8 +150,10 @@ def wake_display():
 # WebSocket handlers
 @socketio.on('connect')
 def handle_connect():
-    """Client connected - send current status"""
+    """Client connected - subscribe to all topics and send current status"""
     print("🌐 Web client connected")
+    for topic in TOPICS:
+        join_room(topic)
     emit('status', {
         'screen': display_app.current_screen,
         'screen_name': display_app.screen_names[display_app.current_screen],
@@ -150,6 +165,18 @@ def handle_disconnect():
     """Client disconnected"""
     print("🌐 Web client disconnected")
 
+@socketio.on('subscribe')
+def handle_subscribe(topics):
+    """Join topic rooms ('screen', 'settings') - accepts a name or a list"""
+    for topic in valid_topics(topics):
+        join_room(topic)
+
+@socketio.on('unsubscribe')
+def handle_unsubscribe(topics):
+    """Leave topic rooms"""
+    for topic in valid_topics(topics):
+        leave_room(topic)
+
 @socketio.on('request_status')
 def handle_status_request():
     """Client requesting status update"""
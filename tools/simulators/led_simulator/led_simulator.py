@@ -17,8 +17,27 @@ This simulates the WS2812B LED strip behavior with realistic RPM/gear physics.
 import tkinter as tk
 from tkinter import messagebox
 import math
+import time
 import colorsys
 
+# On Windows the held pedal keys are polled once per frame with GetAsyncKeyState,
+# which avoids Tk's autorepeat press/release storms and their event-queue lag
+try:
+    import ctypes
+    _user32 = ctypes.windll.user32
+except (ImportError, AttributeError, OSError):
+    _user32 = None
+
+VK_LEFT, VK_UP, VK_RIGHT, VK_DOWN = 0x25, 0x26, 0x27, 0x28
+VK_LSHIFT, VK_RSHIFT = 0xA0, 0xA1
+
+# NumPy is optional - only used to color whole RPM arrays in one pass
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 # ============================================================================
 # Configuration (matching config.h from Arduino)
 # ============================================================================
@@ -28,6 +47,8 @@ RPM_MIN_DISPLAY = 1000
 RPM_MAX_DISPLAY = 7000
 RPM_SHIFT_LIGHT = 6500
 RPM_REDLINE = 7200
+FRAME_INTERVAL = 1 / 60  # seconds (60 FPS) - physics, gauges, labels
+LED_FRAME_INTERVAL = 1 / 30  # seconds (30 FPS) - LED strip and shift-light flash
 
 # Gear ratios for realistic simulation (Mazda MX-5 NC 6-speed)
 GEAR_RATIOS = {
@@ -42,17 +63,39 @@ GEAR_RATIOS = {
 FINAL_DRIVE = 4.100
 TIRE_CIRCUMFERENCE = 1.937  # meters (205/45R17)
 
+# Engine RPM per km/h for each gear (index 0 = neutral):
+# km/h -> m/s (/3.6) -> wheel RPM (*60 / circumference) -> engine RPM (*ratio *final drive)
+_GEAR_K = tuple(GEAR_RATIOS.get(gear, 0.0) * FINAL_DRIVE * 60.0 / (3.6 * TIRE_CIRCUMFERENCE)
+                for gear in range(7))
+
 # Physics simulation
 RPM_ACCEL_RATE = 50  # RPM per frame when accelerating
 RPM_DECEL_RATE = 30  # RPM per frame when decelerating
 RPM_IDLE_RETURN_RATE = 20  # RPM per frame returning to idle
 SPEED_ACCEL_RATE = 0.5  # km/h per frame
 SPEED_DECEL_RATE = 1.0  # km/h per frame
+SPEED_MAX = 200  # km/h
+
+# Speed is simulated in integer tenths of km/h so state compares stay exact
+SPEED_ACCEL_STEP = round(SPEED_ACCEL_RATE * 10)
+SPEED_DECEL_STEP = round(SPEED_DECEL_RATE * 10)
+
+# Gauge geometry (both gauges share the same 300x300 layout)
+GAUGE_CENTER = 150
+GAUGE_RADIUS = 120
+
+# Unit vectors for every whole degree of the 270 degree sweep (-225 to 45),
+# indexed by degrees from the zero mark - needles and ticks never call trig
+_GAUGE_VECTORS = tuple((math.cos(math.radians(d)), math.sin(math.radians(d)))
+                       for d in range(-225, 46))
+
+# The 11 tick marks sit every 27 degrees
+_GAUGE_TICKS = _GAUGE_VECTORS[::27]
 
 # ============================================================================
 # LED Color Calculation (matching Arduino logic)
 # ============================================================================
-def get_rpm_color(rpm):
+def _calc_rpm_color(rpm):
     """
     Calculate LED color based on RPM.
     Returns RGB tuple (0-255 for each channel).
@@ -90,7 +133,26 @@ def get_rpm_color(rpm):
     
     return (r, g, b)
 
-def get_active_led_count(rpm):
+def get_rpm_colors(rpms):
+    """
+    Vectorized _calc_rpm_color for an array of RPM values.
+    Returns an (N, 3) uint8 array of RGB colors (requires NumPy).
+    """
+    rpms = np.asarray(rpms, dtype=np.float64)
+    position = np.clip((rpms - RPM_MIN_DISPLAY) / (RPM_MAX_DISPLAY - RPM_MIN_DISPLAY), 0.0, 1.0)
+    
+    # Same piecewise gradient as _calc_rpm_color: Green -> Yellow -> Orange -> Red
+    segments = [position < 0.33, position < 0.66]
+    r = np.select(segments, [position / 0.33 * 255, 255.0], 255.0)
+    g = np.select(segments, [255.0, 255 - (position - 0.33) / 0.33 * 100],
+                  155 - (position - 0.66) / 0.34 * 155)
+    rgb = np.stack([r, g, np.zeros_like(r)], axis=-1).astype(np.uint8)
+    
+    rgb[rpms < RPM_MIN_DISPLAY] = 0
+    rgb[rpms >= RPM_SHIFT_LIGHT] = (255, 0, 0)
+    return rgb
+
+def _calc_active_led_count(rpm):
     """Calculate how many LEDs should be lit based on RPM."""
     if rpm < RPM_MIN_DISPLAY:
         return 0
@@ -102,6 +164,47 @@ def get_active_led_count(rpm):
     count = int(((rpm - RPM_MIN_DISPLAY) / (RPM_MAX_DISPLAY - RPM_MIN_DISPLAY)) * LED_COUNT)
     return max(0, min(LED_COUNT, count))
 
+def _build_rpm_lut():
+    """Tabulate (r, g, b, active_count) for every integer RPM up to redline."""
+    if NUMPY_AVAILABLE:
+        rpms = np.arange(RPM_REDLINE + 1)
+        counts = np.clip((rpms - RPM_MIN_DISPLAY) / (RPM_MAX_DISPLAY - RPM_MIN_DISPLAY) * LED_COUNT,
+                         0, LED_COUNT).astype(np.uint8)
+        table = np.column_stack([get_rpm_colors(rpms), counts])
+        return tuple(map(tuple, table.tolist()))
+    return tuple(_calc_rpm_color(rpm) + (_calc_active_led_count(rpm),)
+                 for rpm in range(RPM_REDLINE + 1))
+
+# RPM is bounded by redline, so color and LED count are table lookups per frame
+_RPM_LUT = _build_rpm_lut()
+
+def get_rpm_color(rpm):
+    """LED color for an RPM as an RGB tuple (0-255 for each channel)."""
+    return _RPM_LUT[max(0, min(int(rpm), RPM_REDLINE))][:3]
+
+def get_active_led_count(rpm):
+    """How many LEDs should be lit for an RPM."""
+    return _RPM_LUT[max(0, min(int(rpm), RPM_REDLINE))][3]
+
+def _build_led_style_lut():
+    """Tabulate get_led_style for every RPM; identical colors share one hex string."""
+    hex_colors = {}
+    table = []
+    for r, g, b, count in _RPM_LUT:
+        hex_color = hex_colors.setdefault((r, g, b), f'#{r:02x}{g:02x}{b:02x}')
+        text_color = "#ffffff" if r + g + b < 400 else "#000000"
+        table.append((count, hex_color, text_color))
+    return tuple(table)
+
+_LED_STYLE_LUT = _build_led_style_lut()
+
+def get_led_style(rpm):
+    """
+    Everything the LED strip needs for an RPM:
+    (active LED count, lit color as '#rrggbb', lit LED number color).
+    """
+    return _LED_STYLE_LUT[max(0, min(int(rpm), RPM_REDLINE))]
+
 # ============================================================================
 # Physics Simulation
 # ============================================================================
@@ -110,11 +213,39 @@ def calculate_rpm_from_speed(speed_kmh, gear):
     if gear == 0 or speed_kmh == 0:
         return RPM_IDLE
     
-    speed_ms = speed_kmh / 3.6  # Convert to m/s
-    wheel_rpm = (speed_ms * 60) / TIRE_CIRCUMFERENCE
-    engine_rpm = wheel_rpm * GEAR_RATIOS[gear] * FINAL_DRIVE
-    
-    return max(RPM_IDLE, min(RPM_REDLINE, int(engine_rpm)))
+    rpm = int(speed_kmh * _GEAR_K[gear])
+    if rpm < RPM_IDLE:
+        return RPM_IDLE
+    return RPM_REDLINE if rpm > RPM_REDLINE else rpm
+
+# ============================================================================
+# Frame Scheduling
+# ============================================================================
+def next_frame_delay(deadline, interval):
+    """
+    Advance a frame deadline by one interval so slow frames don't accumulate
+    drift; if we fall a whole frame behind, drop it and resync.
+    Returns (new deadline, after() delay in ms).
+    """
+    now = time.monotonic()
+    deadline += interval
+    if now > deadline + interval:
+        deadline = now + interval
+    return deadline, max(1, int((deadline - now) * 1000))
+
+# ============================================================================
+# Status Bar
+# ============================================================================
+def _build_status_lut():
+    """Status bar text for every throttle/brake/clutch/shift combination (bits 0-3)."""
+    labels = ("⚡ THROTTLE", "🔴 BRAKE", "⚙️ CLUTCH", "🔺 SHIFT!")
+    table = []
+    for flags in range(16):
+        parts = [label for bit, label in enumerate(labels) if flags & (1 << bit)]
+        table.append(" | ".join(parts) if parts else "Ready")
+    return tuple(table)
+
+STATUS_LUT = _build_status_lut()
 
 # ============================================================================
 # Main Simulator Class
@@ -129,13 +260,26 @@ class LEDSimulator:
         
         # Simulation state
         self.rpm = RPM_IDLE
-        self.speed = 0.0  # km/h
+        self.speed_10 = 0  # km/h in tenths (see speed)
         self.gear = 1
         self.throttle = False
         self.brake = False
         self.clutch = False
         self.shift_light_flash = False
         
+        # Key polling state (Windows only, see poll_keys)
+        self._has_focus = True
+        self._shift_keys_held = (False, False)  # (up, down) on the last poll
+        
+        # Last drawn state per widget - redraws are skipped while unchanged
+        self._gauge_drawn = {}  # canvas -> (value, color)
+        self._leds_drawn = None
+        self._status_drawn = None
+        self._gear_drawn = None
+        
+        # Widget updates for the current simulation frame (see _queue)
+        self._pending = []
+        
         # Create UI
         self.create_ui()
         
@@ -143,9 +287,18 @@ class LEDSimulator:
         self.root.bind('<KeyPress>', self.on_key_press)
         self.root.bind('<KeyRelease>', self.on_key_release)
         self.root.bind('<Escape>', self.on_escape)
+        self.root.bind('<FocusIn>', self.on_focus_change)
+        self.root.bind('<FocusOut>', self.on_focus_change)
         
-        # Start simulation loop
+        # Start simulation and LED strip loops (each runs at its own rate)
+        self._next_deadline = self._next_led_deadline = time.monotonic()
         self.update_simulation()
+        self.update_leds()
+    
+    @property
+    def speed(self):
+        """Vehicle speed in km/h."""
+        return self.speed_10 / 10
     
     def create_ui(self):
         """Create the user interface."""
@@ -191,6 +344,10 @@ class LEDSimulator:
                                      bg="#1a1a1a", highlightthickness=0)
         self.speed_canvas.pack(side=tk.LEFT, padx=20)
         
+        # Static gauge faces are drawn once; frames only move the needle/value
+        self.rpm_gauge = self.create_gauge(self.rpm_canvas, RPM_REDLINE, "RPM")
+        self.speed_gauge = self.create_gauge(self.speed_canvas, SPEED_MAX, "SPEED")
+        
         # Gear indicator
         self.gear_frame = tk.Frame(self.root, bg="#2a2a2a", relief=tk.RIDGE, bd=3)
         self.gear_frame.pack(pady=10)
@@ -214,18 +371,33 @@ class LEDSimulator:
                                    bg="#000000", highlightthickness=0)
         self.led_canvas.pack(pady=10, padx=10)
         
+        # LED items are created once; lit ones carry the "lit"/"lit_num" tags so
+        # draw_leds can recolor the whole lit segment with one call per tag
+        led_width = 30
+        led_height = 50
+        spacing = 2
+        self.led_rects = []
+        self.led_texts = []
+        for i in range(LED_COUNT):
+            x = 10 + i * (led_width + spacing)
+            self.led_rects.append(self.led_canvas.create_rectangle(
+                x, 5, x + led_width, 5 + led_height,
+                fill="#1a1a1a", outline="#333333", width=1))
+            self.led_texts.append(self.led_canvas.create_text(
+                x + led_width/2, 30, text=str(i+1), fill="#444444", font=("Arial", 8)))
+        self._lit_count = 0
+        
         # Status bar
         self.status_label = tk.Label(self.root, text="Ready | Press UP to accelerate", 
                                     font=("Arial", 10), fg="#00ff00", bg="#1a1a1a")
         self.status_label.pack(pady=5)
     
-    def draw_gauge(self, canvas, value, max_value, label, unit, color):
-        """Draw a circular gauge."""
-        canvas.delete("all")
-        
+    def create_gauge(self, canvas, max_value, label):
+        """Draw the static face of a circular gauge.
+        Returns the (needle, center, value text) item ids updated each frame."""
         # Gauge parameters
-        center_x, center_y = 150, 150
-        radius = 120
+        center_x = center_y = GAUGE_CENTER
+        radius = GAUGE_RADIUS
         
         # Background circle
         canvas.create_oval(center_x - radius, center_y - radius,
@@ -233,89 +405,99 @@ class LEDSimulator:
                           outline="#333333", width=3)
         
         # Tick marks
-        for i in range(0, 11):
-            angle = (i / 10) * 270 - 225  # -225 to 45 degrees
-            angle_rad = math.radians(angle)
-            
-            start_x = center_x + (radius - 15) * math.cos(angle_rad)
-            start_y = center_y + (radius - 15) * math.sin(angle_rad)
-            end_x = center_x + (radius - 5) * math.cos(angle_rad)
-            end_y = center_y + (radius - 5) * math.sin(angle_rad)
+        for i, (cos_a, sin_a) in enumerate(_GAUGE_TICKS):
+            start_x = center_x + (radius - 15) * cos_a
+            start_y = center_y + (radius - 15) * sin_a
+            end_x = center_x + (radius - 5) * cos_a
+            end_y = center_y + (radius - 5) * sin_a
             
             canvas.create_line(start_x, start_y, end_x, end_y, 
                              fill="#666666", width=2)
             
             # Labels
             label_value = int((i / 10) * max_value)
-            label_x = center_x + (radius - 35) * math.cos(angle_rad)
-            label_y = center_y + (radius - 35) * math.sin(angle_rad)
+            label_x = center_x + (radius - 35) * cos_a
+            label_y = center_y + (radius - 35) * sin_a
             canvas.create_text(label_x, label_y, text=str(label_value), 
                              fill="#888888", font=("Arial", 10))
         
-        # Needle
-        value_ratio = min(value / max_value, 1.0)
-        needle_angle = (value_ratio * 270 - 225)
-        needle_angle_rad = math.radians(needle_angle)
-        
-        needle_x = center_x + (radius - 20) * math.cos(needle_angle_rad)
-        needle_y = center_y + (radius - 20) * math.sin(needle_angle_rad)
-        
-        canvas.create_line(center_x, center_y, needle_x, needle_y, 
-                          fill=color, width=4, arrow=tk.LAST, arrowshape=(10, 12, 5))
+        # Needle (positioned by draw_gauge)
+        needle = canvas.create_line(center_x, center_y, center_x, center_y, 
+                                   width=4, arrow=tk.LAST, arrowshape=(10, 12, 5))
         
         # Center circle
-        canvas.create_oval(center_x - 10, center_y - 10,
-                          center_x + 10, center_y + 10,
-                          fill="#555555", outline=color, width=2)
+        center = canvas.create_oval(center_x - 10, center_y - 10,
+                                   center_x + 10, center_y + 10,
+                                   fill="#555555", width=2)
         
         # Label
         canvas.create_text(center_x, center_y + 60, text=label, 
                           fill="#ffffff", font=("Arial", 14, "bold"))
         
         # Value
-        canvas.create_text(center_x, center_y + 85, 
-                          text=f"{int(value)} {unit}", 
-                          fill=color, font=("Arial", 16, "bold"))
+        value_text = canvas.create_text(center_x, center_y + 85, 
+                                       font=("Arial", 16, "bold"))
+        return needle, center, value_text
     
-    def draw_leds(self):
-        """Draw the LED strip."""
-        self.led_canvas.delete("all")
+    def draw_gauge(self, canvas, gauge, value, max_value, unit, color):
+        """Move a gauge's needle and update its value readout."""
+        value = int(value)
+        if self._gauge_drawn.get(canvas) == (value, color):
+            return  # Needle and readout already show this
+        self._gauge_drawn[canvas] = (value, color)
+        needle, center, value_text = gauge
         
-        active_count = get_active_led_count(self.rpm)
-        led_width = 30
-        led_height = 50
-        spacing = 2
+        # Gauge parameters
+        center_x = center_y = GAUGE_CENTER
+        radius = GAUGE_RADIUS
         
-        for i in range(LED_COUNT):
-            x = 10 + i * (led_width + spacing)
-            
-            if i < active_count:
-                # Shift light flash effect
-                if self.rpm >= RPM_SHIFT_LIGHT and self.shift_light_flash:
-                    color = "#ff0000"
-                else:
-                    rgb = get_rpm_color(self.rpm)
-                    color = f'#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}'
-            else:
-                color = "#1a1a1a"  # Off
-            
-            # Draw LED
-            self.led_canvas.create_rectangle(x, 5, x + led_width, 5 + led_height,
-                                            fill=color, outline="#333333", width=1)
-            
-            # LED number
-            if i < active_count:
-                text_color = "#ffffff" if sum(get_rpm_color(self.rpm)) < 400 else "#000000"
-            else:
-                text_color = "#444444"
-            
-            self.led_canvas.create_text(x + led_width/2, 30, 
-                                       text=str(i+1), 
-                                       fill=text_color, 
-                                       font=("Arial", 8))
+        # Needle (whole-degree resolution)
+        value_ratio = max(0.0, min(value / max_value, 1.0))
+        cos_a, sin_a = _GAUGE_VECTORS[int(value_ratio * 270)]
+        
+        needle_x = center_x + (radius - 20) * cos_a
+        needle_y = center_y + (radius - 20) * sin_a
+        
+        self._queue(canvas.coords, needle, center_x, center_y, needle_x, needle_y)
+        self._queue(canvas.itemconfig, needle, fill=color)
+        self._queue(canvas.itemconfig, center, outline=color)
+        
+        # Value
+        self._queue(canvas.itemconfig, value_text, text=f"{value} {unit}", fill=color)
+    
+    def draw_leds(self):
+        """Update the LED strip colors."""
+        # Every lit LED shares the same color - one table lookup per frame
+        active_count, lit_color, lit_text_color = get_led_style(self.rpm)
+        if self.rpm >= RPM_SHIFT_LIGHT and self.shift_light_flash:
+            lit_color = "#ff0000"  # Shift light flash effect
+        
+        drawn = (active_count, lit_color, lit_text_color)
+        if drawn == self._leds_drawn:
+            return  # Strip already shows this
+        self._leds_drawn = drawn
+        
+        canvas = self.led_canvas
+        
+        # Only LEDs between the old and new count change lit/off state
+        for i in range(self._lit_count, active_count):
+            canvas.addtag_withtag("lit", self.led_rects[i])
+            canvas.addtag_withtag("lit_num", self.led_texts[i])
+        for i in range(active_count, self._lit_count):
+            canvas.dtag(self.led_rects[i], "lit")
+            canvas.dtag(self.led_texts[i], "lit_num")
+            canvas.itemconfig(self.led_rects[i], fill="#1a1a1a")  # Off
+            canvas.itemconfig(self.led_texts[i], fill="#444444")
+        self._lit_count = active_count
+        
+        # Recolor every lit LED and its number in one call each
+        canvas.itemconfig("lit", fill=lit_color)
+        canvas.itemconfig("lit_num", fill=lit_text_color)
     
     def update_simulation(self):
         """Main simulation loop."""
+        if _user32 is not None:
+            self.poll_keys()
         
         # Physics simulation
         if self.clutch:
@@ -326,18 +508,18 @@ class LEDSimulator:
                 # Return to idle
                 if self.rpm > RPM_IDLE:
                     self.rpm = max(RPM_IDLE, self.rpm - RPM_IDLE_RETURN_RATE)
+        elif self.throttle:
+            # Normal driving - accelerate
+            self.rpm = min(RPM_REDLINE, self.rpm + RPM_ACCEL_RATE)
+            self.speed_10 = min(SPEED_MAX * 10, self.speed_10 + SPEED_ACCEL_STEP)
         else:
-            # Normal driving - RPM linked to speed/gear
+            # Normal driving - RPM linked to speed/gear (computed once, after braking)
+            if self.brake:
+                self.speed_10 = max(0, self.speed_10 - SPEED_DECEL_STEP)
             target_rpm = calculate_rpm_from_speed(self.speed, self.gear)
             
-            if self.throttle:
-                # Accelerate
-                self.rpm = min(RPM_REDLINE, self.rpm + RPM_ACCEL_RATE)
-                self.speed = min(200, self.speed + SPEED_ACCEL_RATE)
-            elif self.brake:
+            if self.brake:
                 # Brake
-                self.speed = max(0, self.speed - SPEED_DECEL_RATE)
-                target_rpm = calculate_rpm_from_speed(self.speed, self.gear)
                 self.rpm = max(target_rpm, self.rpm - RPM_DECEL_RATE)
             else:
                 # Coast - RPM follows gear ratio
@@ -349,42 +531,83 @@ class LEDSimulator:
                 else:
                     self.rpm = target_rpm
         
-        # Shift light flash effect
-        self.shift_light_flash = not self.shift_light_flash
-        
         # Update UI
-        self.draw_gauge(self.rpm_canvas, self.rpm, RPM_REDLINE, "RPM", "rpm", 
+        self.draw_gauge(self.rpm_canvas, self.rpm_gauge, self.rpm, RPM_REDLINE, "rpm", 
                        "#ff0000" if self.rpm >= RPM_SHIFT_LIGHT else "#00ff00")
         
-        self.draw_gauge(self.speed_canvas, self.speed, 200, "SPEED", "km/h", "#00aaff")
-        
-        self.gear_label.config(text=str(self.gear))
-        if self.clutch:
-            self.gear_label.config(fg="#ffff00")  # Yellow when clutch engaged
-        else:
-            self.gear_label.config(fg="#00ff00")  # Green normally
+        self.draw_gauge(self.speed_canvas, self.speed_gauge, self.speed, SPEED_MAX, "km/h", "#00aaff")
         
-        self.draw_leds()
+        # Yellow when clutch engaged, green normally - one config, only on change
+        gear_style = (str(self.gear), "#ffff00" if self.clutch else "#00ff00")
+        if gear_style != self._gear_drawn:
+            self._gear_drawn = gear_style
+            self._queue(self.gear_label.config, text=gear_style[0], fg=gear_style[1])
         
         # Status update
-        status_parts = []
-        if self.throttle:
-            status_parts.append("⚡ THROTTLE")
-        if self.brake:
-            status_parts.append("🔴 BRAKE")
-        if self.clutch:
-            status_parts.append("⚙️ CLUTCH")
-        if self.rpm >= RPM_SHIFT_LIGHT:
-            status_parts.append("🔺 SHIFT!")
+        status = STATUS_LUT[self.throttle | (self.brake << 1) | (self.clutch << 2)
+                            | ((self.rpm >= RPM_SHIFT_LIGHT) << 3)]
+        if status != self._status_drawn:
+            self._status_drawn = status
+            self._queue(self.status_label.config, text=status)
         
-        status = " | ".join(status_parts) if status_parts else "Ready"
-        self.status_label.config(text=status)
+        self._flush_pending()
         
-        # Schedule next frame (60 FPS)
-        self.root.after(16, self.update_simulation)
+        # Schedule next frame against a fixed 60 FPS deadline
+        self._next_deadline, delay_ms = next_frame_delay(self._next_deadline, FRAME_INTERVAL)
+        self.root.after(delay_ms, self.update_simulation)
+    
+    def _queue(self, func, *args, **kwargs):
+        """Defer a widget update until the end of the simulation frame."""
+        self._pending.append((func, args, kwargs))
+    
+    def _flush_pending(self):
+        """Apply this frame's widget updates and redraw once."""
+        if not self._pending:
+            return  # Nothing changed - leave Tk idle
+        for func, args, kwargs in self._pending:
+            func(*args, **kwargs)
+        self._pending.clear()
+        self.root.update_idletasks()
+    
+    def update_leds(self):
+        """LED strip loop - the strip doesn't need the full simulation rate."""
+        # Shift light flash effect (toggles once per LED frame)
+        self.shift_light_flash = not self.shift_light_flash
+        
+        self.draw_leds()
+        
+        self._next_led_deadline, delay_ms = next_frame_delay(self._next_led_deadline, LED_FRAME_INTERVAL)
+        self.root.after(delay_ms, self.update_leds)
+    
+    def poll_keys(self):
+        """Read pedal, clutch and shift keys directly from Windows."""
+        if not self._has_focus:
+            return
+        key_state = _user32.GetAsyncKeyState
+        self.throttle = bool(key_state(VK_UP) & 0x8000)
+        self.brake = bool(key_state(VK_DOWN) & 0x8000)
+        self.clutch = bool((key_state(VK_LSHIFT) | key_state(VK_RSHIFT)) & 0x8000)
+        
+        # Shift on the press edge only, so holding an arrow is a single shift
+        shift_keys = (bool(key_state(VK_RIGHT) & 0x8000), bool(key_state(VK_LEFT) & 0x8000))
+        if shift_keys[0] and not self._shift_keys_held[0] and self.gear < 6:
+            self.gear += 1
+        if shift_keys[1] and not self._shift_keys_held[1] and self.gear > 1:
+            self.gear -= 1
+        self._shift_keys_held = shift_keys
+    
+    def on_focus_change(self, event):
+        """Track window focus; release all inputs when focus is lost."""
+        if event.widget is not self.root:
+            return
+        self._has_focus = event.type == tk.EventType.FocusIn
+        if not self._has_focus:
+            self.throttle = self.brake = self.clutch = False
     
     def on_key_press(self, event):
         """Handle key press events."""
+        if _user32 is not None:
+            return  # Keys are polled in poll_keys
         if event.keysym == 'Up':
             self.throttle = True
         elif event.keysym == 'Down':
@@ -400,6 +623,8 @@ class LEDSimulator:
     
     def on_key_release(self, event):
         """Handle key release events."""
+        if _user32 is not None:
+            return  # Keys are polled in poll_keys
         if event.keysym == 'Up':
             self.throttle = False
         elif event.keysym == 'Down':
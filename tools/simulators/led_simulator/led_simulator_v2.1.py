@@ -36,11 +36,15 @@ import tkinter as tk
 from tkinter import messagebox, filedialog, ttk, scrolledtext
 import json
 import os
-from datetime import datetime
 import math
+import random
+import time
 import wave
-import struct
+import array
 import threading
+import queue
+from collections import deque
+from functools import partial, lru_cache
 try:
     import pyaudio
     AUDIO_AVAILABLE = True
@@ -56,6 +60,54 @@ except ImportError:
     SERIAL_AVAILABLE = False
     print("Note: pyserial not available. Install with 'pip install pyserial' for Arduino connection.")
 
+# NumPy is optional - engine audio is synthesized a whole chunk at a time with it
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Numba is optional - compiles the per-sample audio renderer (preferred over NumPy)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = NUMPY_AVAILABLE
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# USB (vendor, product) IDs of Arduino boards and the USB-serial chips on clones
+# (product None = any product from that vendor)
+ARDUINO_USB_IDS = frozenset([
+    (0x2341, None),    # Arduino (Uno, Nano, Leonardo, ...)
+    (0x1A86, 0x7523),  # WCH CH340 (Nano clones)
+    (0x0403, 0x6001),  # FTDI FT232R
+    (0x10C4, 0xEA60),  # Silicon Labs CP210x
+])
+
+
+def is_arduino_port(port):
+    """Check whether a list_ports entry looks like an Arduino (by USB VID/PID)."""
+    if port.vid is None:
+        # No USB descriptor (e.g. some Bluetooth/virtual ports) - fall back to the description
+        description = (port.description or "").lower()
+        return "arduino" in description or "ch340" in description
+    return (port.vid, port.pid) in ARDUINO_USB_IDS or (port.vid, None) in ARDUINO_USB_IDS
+
+
+# Boards that reset when the port is opened (DTR pulses the bootloader) and need
+# ~2 s before accepting commands. Native USB (CDC-ACM) boards don't reset.
+RESET_ON_OPEN_USB_IDS = frozenset([
+    (0x2341, 0x0043),  # Arduino Uno R3
+    (0x2341, 0x0001),  # Arduino Uno (original)
+    (0x1A86, 0x7523),  # WCH CH340 (Nano clones)
+    (0x0403, 0x6001),  # FTDI FT232R
+    (0x10C4, 0xEA60),  # Silicon Labs CP210x
+])
+
+
+def port_resets_on_open(usb_id):
+    """Check whether opening a port with this (vid, pid) resets the board (unknown ports assume yes)."""
+    return usb_id is None or usb_id[0] is None or usb_id in RESET_ON_OPEN_USB_IDS
+
 # ============================================================================
 # LED Configuration - DEFAULT VALUES (can be overridden from Arduino)
 # ============================================================================
@@ -185,6 +237,7 @@ def load_arduino_config():
         print(f"✓ State 3 RPM: {STATE_3_RPM_MIN}-{STATE_3_RPM_MAX}")
         print(f"✓ State 4 RPM: {STATE_4_RPM_MIN}-{STATE_4_RPM_MAX}")
         print(f"✓ State 5 RPM: {STATE_5_RPM_MIN}+")
+        _build_rpm_state_lut()  # Thresholds changed
         return True
         
     except Exception as e:
@@ -195,18 +248,267 @@ def load_arduino_config():
 # ============================================================================
 # Audio Engine (Synthesized Engine Sound)
 # ============================================================================
+# Exhaust note harmonics (k, amplitude, phase offset) as sin/cos weights, so
+# amplitude*sin(k*w + offset) = a*sin(k*w) + b*cos(k*w)
+_EXHAUST_HARMONICS = tuple((k, amp * math.cos(offset), amp * math.sin(offset))
+                           for k, amp, offset in ((1, 0.40, 0.0), (2, 0.24, 0.5), (3, 0.16, 1.2),
+                                                  (4, 0.10, 0.8), (5, 0.06, 0.3)))
+
+def _harmonic_bank(w, count):
+    """
+    sin(k*w) and cos(k*w) for k = 0..count, as two (count+1, len(w)) arrays.
+    Only sin(w) and cos(w) are evaluated; each higher harmonic comes from the
+    Chebyshev recurrence x[k+1] = 2*cos(w)*x[k] - x[k-1] (one multiply and
+    one subtract per sample).
+    """
+    bank = np.empty((2, count + 1, len(w)))
+    bank[0, 0] = 0.0
+    bank[1, 0] = 1.0
+    np.sin(w, out=bank[0, 1])
+    np.cos(w, out=bank[1, 1])
+    two_cos = 2.0 * bank[1, 1]
+    for k in range(1, count):
+        np.multiply(two_cos, bank[:, k], out=bank[:, k + 1])
+        bank[:, k + 1] -= bank[:, k - 1]
+    return bank[0], bank[1]
+
+# Running oscillator phases wrap at these periods, over which every partial
+# completes a whole number of cycles - sin() arguments stay small and the
+# wrap is seamless
+ENGINE_PHASE_PERIOD = 40.0  # Firing cycles (partials at 0.375x to 13x the firing rate)
+LFO_PERIOD = 10.0           # Seconds (2.3 Hz exhaust modulator)
+
+# One firing period of each fixed-timbre layer, looked up by position in the
+# firing cycle instead of evaluating its harmonics every sample
+WAVETABLE_SIZE = 2048
+
+def _build_wavetables():
+    """
+    Returns a (5, WAVETABLE_SIZE + 1) array - explosion tone, exhaust note,
+    mechanical noise, rasp and burble tone - with the first sample repeated
+    at the end so interpolation never has to wrap.
+    """
+    S, C = _harmonic_bank(np.arange(WAVETABLE_SIZE + 1) * (2 * math.pi / WAVETABLE_SIZE), 13)
+    exhaust = sum(a * S[k] + b * C[k] for k, a, b in _EXHAUST_HARMONICS)
+    return np.stack([
+        S[3] + 0.35 * S[5] + 0.15 * S[7],               # Explosion tone
+        exhaust,                                        # Exhaust note
+        S[7] + 0.7 * S[11] + 0.4 * S[13],               # Mechanical noise
+        S[5] + 0.8 * S[7] + 0.5 * S[9] + 0.3 * S[11],   # High RPM rasp
+        1.0 + 0.3 * S[2],                               # Burble tone
+    ])
+
+# Seconds of roughness noise, read cyclically - long enough not to be heard looping
+NOISE_SECONDS = 5
+
+@lru_cache(maxsize=None)
+def _roughness_noise(rate):
+    """
+    Seeded white noise through two one-pole low-passes: a dark row (~700 Hz,
+    idle) and a bright row (~3.5 kHz, redline) that renderers crossfade by
+    RPM. Both rows are scaled to RMS 0.5, the level of the sin*sin roughness
+    they replace. Built once per sample rate.
+    """
+    rng = random.Random(0)
+    white = [rng.gauss(0.0, 1.0) for _ in range(NOISE_SECONDS * rate)]
+    rows = []
+    for cutoff in (700.0, 3500.0):
+        a = math.exp(-2 * math.pi * cutoff / rate)
+        y = 0.0
+        row = []
+        for x in white:
+            y += (1.0 - a) * (x - y)
+            row.append(y)
+        gain = 0.5 / math.sqrt(sum(v * v for v in row) / len(row))
+        rows.append(array.array('f', [v * gain for v in row]))
+    if NUMPY_AVAILABLE:
+        return np.array(rows, dtype=np.float32)
+    return tuple(rows)
+
+# Backfire pops - about as often and as long as the old sine-product gate opened
+BURBLE_RATE = 4.0      # Pops per second
+BURBLE_LENGTH = 0.009  # Seconds each pop lasts
+
+@lru_cache(maxsize=None)
+def _burble_gate(rate):
+    """
+    Seeded on/off (1.0/0.0) gate for the backfire burble, as long as the
+    _roughness_noise rows so both are read at the same position. Pops start
+    as Bernoulli trials averaging BURBLE_RATE per second and each holds
+    for BURBLE_LENGTH. Built once per sample rate.
+    """
+    rng = random.Random(1)
+    length = NOISE_SECONDS * rate
+    chance = BURBLE_RATE / rate
+    hold = int(BURBLE_LENGTH * rate)
+    gate = array.array('f', bytes(4 * length))
+    open_until = 0
+    for i in range(length):
+        if rng.random() < chance:
+            open_until = i + hold
+        if i < open_until:
+            gate[i] = 1.0
+    if NUMPY_AVAILABLE:
+        return np.array(gate, dtype=np.float32)
+    return gate
+
+def _render_chunk(out, cycle, cycle_step, step_delta, lfo_time, lfo_step, noise, gate, noise_pos,
+                  rpm_ratio, volume):
+    """
+    Synthesize one chunk sample by sample into out. cycle is the running
+    firing phase (in firing cycles) and lfo_time the running modulator clock
+    (in seconds); both advance by their step per sample, and cycle_step
+    itself grows by step_delta per sample so pitch glides across the chunk
+    instead of jumping at its boundary. noise and gate are the
+    _roughness_noise and _burble_gate tables and noise_pos the running read
+    position in both. The
+    advanced (cycle, lfo_time, noise_pos) are returned. Plain math only, so
+    the same code runs as Python (no NumPy) or compiled by Numba.
+    """
+    # RPM only changes between chunks - layer gains and gates are computed once
+    # More pronounced at lower RPMs, crisper at high RPMs
+    explosion_strength = 0.48 * (1.0 - rpm_ratio * 0.25)
+    # Increases with RPM, more pronounced at high revs
+    intake_amount = 0.10 * (rpm_ratio ** 1.5)
+    # Higher frequency components, more present at high RPM
+    mechanical_amount = 0.06 + (0.03 * rpm_ratio)
+    # Stronger at lower RPMs, adds depth
+    rumble_amount = 0.18 * (1.0 - rpm_ratio * 0.4)
+    # More pronounced at lower RPMs (idle)
+    roughness_amount = 0.14 * (1.0 - rpm_ratio * 0.65)
+    # ...and brighter as the revs rise
+    brightness = min(1.0, rpm_ratio)
+    dark = noise[0]
+    bright = noise[1]
+    noise_len = len(dark)
+    rasp_on = rpm_ratio > 0.55
+    rasp_amount = ((rpm_ratio - 0.55) ** 1.3) * 0.6 * 0.20 if rasp_on else 0.0
+    burble_on = 0.35 < rpm_ratio < 0.82
+    
+    for i in range(len(out)):
+        w = 2 * math.pi * cycle       # Firing phase in radians
+        lfo = 2 * math.pi * lfo_time  # Modulator clock in radians
+        
+        # 1. COMBUSTION EXPLOSIONS - sharp, percussive
+        # Use pulse train for individual cylinder firings
+        explosion_cycle = cycle - math.floor(cycle)
+        if explosion_cycle < 0.10:
+            # Sharper attack with more aggressive decay
+            explosion = (explosion_strength * math.exp(-explosion_cycle * 30) *
+                         (math.sin(3 * w) + 0.35 * math.sin(5 * w) + 0.15 * math.sin(7 * w)))
+        else:
+            explosion = 0.0
+        
+        # 2. EXHAUST NOTE - raspy, with harmonics
+        # Dominant component, varies with RPM
+        exhaust_note = (0.40 * math.sin(w) +
+                        0.24 * math.sin(2 * w + 0.5) +
+                        0.16 * math.sin(3 * w + 1.2) +
+                        0.10 * math.sin(4 * w + 0.8) +
+                        0.06 * math.sin(5 * w + 0.3))
+        # Add phase modulation for more organic sound
+        exhaust_note *= 1.0 + 0.06 * math.sin(2.3 * lfo)
+        
+        # 3. INTAKE SOUND - subtle whoosh at 0.7x the firing frequency
+        intake = intake_amount * (math.sin(0.7 * w) + 0.3 * math.sin(1.05 * w))
+        
+        # 4. MECHANICAL NOISE - valvetrain, pistons
+        mechanical = mechanical_amount * (math.sin(7 * w) + 0.7 * math.sin(11 * w) +
+                                          0.4 * math.sin(13 * w))
+        
+        # 5. SUB-BASS RUMBLE - engine block vibrations at 0.5x the firing frequency
+        rumble = rumble_amount * (math.sin(0.5 * w) + 0.3 * math.sin(0.375 * w))
+        
+        # 6. ENGINE ROUGHNESS - combustion irregularities (filtered noise)
+        roughness = roughness_amount * (dark[noise_pos] +
+                                        brightness * (bright[noise_pos] - dark[noise_pos]))
+        
+        # 7. HIGH RPM RASP - screaming exhaust at high revs
+        rasp = 0.0
+        if rasp_on:
+            rasp = rasp_amount * (math.sin(5 * w) + 0.8 * math.sin(7 * w) +
+                                  0.5 * math.sin(9 * w) + 0.3 * math.sin(11 * w))
+        
+        # 8. BACKFIRE/BURBLE - occasional pops (especially mid-RPM)
+        burble = 0.0
+        if burble_on and gate[noise_pos] > 0.0:
+            burble = 0.10 * math.exp(-explosion_cycle * 35) * (1.0 + 0.3 * math.sin(2 * w))
+        
+        # Combine all engine sounds
+        sample = (explosion + exhaust_note + intake + mechanical +
+                  rumble + roughness + rasp + burble) * volume
+        
+        # Soft clipping for more natural saturation (tanh via its [5/4] Pade
+        # approximant - within 4e-7 over the clipped range, no transcendental)
+        sample = max(-1.0, min(1.0, sample))
+        if abs(sample) > 0.8:
+            x = sample / 0.8
+            x2 = x * x
+            sample = 0.8 * x * (945.0 + x2 * (105.0 + x2)) / (945.0 + x2 * (420.0 + 15.0 * x2))
+        
+        out[i] = sample
+        
+        cycle += cycle_step
+        cycle_step += step_delta
+        if cycle >= ENGINE_PHASE_PERIOD:
+            cycle -= ENGINE_PHASE_PERIOD
+        lfo_time += lfo_step
+        if lfo_time >= LFO_PERIOD:
+            lfo_time -= LFO_PERIOD
+        noise_pos += 1
+        if noise_pos == noise_len:
+            noise_pos = 0
+    
+    return cycle, lfo_time, noise_pos
+
+def _upsample_2x(out, samples, last):
+    """
+    Linear 2x upsampling of samples into out: odd outputs are the samples,
+    even outputs the midpoints before them (last is the previous chunk's
+    final sample, so chunks join smoothly). Returns the new last sample.
+    """
+    if NUMPY_AVAILABLE:
+        out[1::2] = samples
+        out[0] = 0.5 * (last + samples[0])
+        midpoints = out[2::2]
+        np.add(samples[:-1], samples[1:], out=midpoints)
+        midpoints *= 0.5
+    else:
+        for i, sample in enumerate(samples):
+            out[2 * i] = 0.5 * (last + sample)
+            out[2 * i + 1] = sample
+            last = sample
+    return samples[-1]
+
+if NUMBA_AVAILABLE:
+    # Compiled on first use and cached on disk; nogil keeps the Tk thread
+    # running while the audio thread renders
+    _render_chunk = njit(cache=True, fastmath=True, nogil=True)(_render_chunk)
+
+if NUMPY_AVAILABLE:
+    _WAVETABLES = _build_wavetables()
+    # Non-harmonic partials of the firing frequency (intake, rumble)
+    _PARTIAL_RATIOS = np.array([0.7, 1.05, 0.5, 0.375])
+
 class AudioEngine:
     """Generates and plays synthesized engine sounds based on RPM."""
     
+    # Rendered chunks queued ahead of playback (~70 ms at 1024 samples/44.1 kHz)
+    BUFFER_CHUNKS = 3
+    
     def __init__(self):
         self.enabled = AUDIO_AVAILABLE
         self.playing = False
         self.rpm = 0
         self.target_rpm = 0
         self.volume = 0.20  # Default volume
+        self.rpm_scale = 1.0 / 7200  # 1 / redline - timbre spans the loaded car's rev range
         self.stream = None
         self.audio_thread = None
         self.pa = None
+        self._chunks = None  # Rendered audio waiting for _pa_callback
+        self._noise = None   # Roughness noise table, built when playback starts
+        self._burble_gate = None  # Backfire pop gate, likewise
         
         if self.enabled:
             try:
@@ -215,12 +517,13 @@ class AudioEngine:
                 print(f"Audio initialization failed: {e}")
                 self.enabled = False
     
-    def start(self, idle_rpm):
-        """Start engine audio."""
+    def start(self, idle_rpm, redline_rpm=7200):
+        """Start engine audio, voiced for a car that revs to redline_rpm."""
         if not self.enabled or self.playing:
             return
         
         self.playing = True
+        self.rpm_scale = 1.0 / redline_rpm
         self.rpm = idle_rpm
         self.target_rpm = idle_rpm
         
@@ -229,18 +532,19 @@ class AudioEngine:
         self.audio_thread.start()
     
     def stop(self):
-        """Stop engine audio."""
+        """Stop engine audio (the audio thread closes its own stream)."""
         self.playing = False
-        if self.stream:
-            try:
-                self.stream.stop_stream()
-                self.stream.close()
-            except:
-                pass
-            self.stream = None
+        if self.audio_thread:
+            # The render thread waits at most 0.1 s for queue space
+            self.audio_thread.join(timeout=0.5)
+            self.audio_thread = None
     
     def update_rpm(self, rpm):
-        """Update target RPM for audio pitch."""
+        """Update target RPM for audio pitch.
+        
+        Only the latest value matters, so this is a plain attribute store the
+        audio thread picks up on its next chunk - the GUI never waits on audio.
+        """
         self.target_rpm = rpm
     
     def set_volume(self, volume):
@@ -254,138 +558,197 @@ class AudioEngine:
         
         sample_rate = 44100
         chunk_size = 1024
+        # The engine's highest partial (13x firing, ~3.1 kHz at redline) and the
+        # brightest roughness noise sit far below 11 kHz, so synthesis runs at
+        # half rate and is upsampled
+        synth_rate = sample_rate // 2
+        synth_size = chunk_size // 2
         
         try:
+            # This thread renders ahead into the queue; PortAudio pulls from it
+            # in _pa_callback, so playback never waits on synthesis or the GIL
+            self._chunks = queue.Queue(maxsize=self.BUFFER_CHUNKS)
             self.stream = self.pa.open(
-                format=pyaudio.paFloat32,
+                format=pyaudio.paInt16,  # Half the bytes of float32 per sample
                 channels=1,
                 rate=sample_rate,
                 output=True,
-                frames_per_buffer=chunk_size
+                frames_per_buffer=chunk_size,
+                stream_callback=self._pa_callback
             )
             
-            phase = 0
-            explosion_phase = 0
-            exhaust_phase = 0
+            # Running phases carry across chunks, so RPM changes never click
+            cycle = 0.0     # Firing cycles, wrapped at ENGINE_PHASE_PERIOD
+            lfo_time = 0.0  # Seconds, wrapped at LFO_PERIOD
+            lfo_step = 1.0 / synth_rate
+            last = 0.0      # Previous chunk's final sample, for upsampling
+            self._noise = _roughness_noise(synth_rate)
+            self._burble_gate = _burble_gate(synth_rate)
+            noise_pos = 0   # Read position in self._noise and self._burble_gate
+            noise_len = NOISE_SECONDS * synth_rate
+            # Audio RPM follows the target through a one-pole low-pass (50 ms
+            # time constant), stepped once per chunk and glided between steps
+            rpm_alpha = 1.0 - math.exp(-synth_size / (0.05 * synth_rate))
+            
+            # Every renderer fills the same float32 buffers, reused for each chunk,
+            # and the result is quantized into pcm for the stream
+            if NUMPY_AVAILABLE:
+                synth = np.empty(synth_size, dtype=np.float32)
+                out = np.empty(chunk_size, dtype=np.float32)
+                pcm = np.empty(chunk_size, dtype=np.int16)
+                ramp = np.arange(synth_size, dtype=np.float64)
+                glide = ramp * (ramp - 1) / 2  # Phase gained from a unit per-sample step increase
+                noise_ramp = np.arange(synth_size)
+            else:
+                synth = array.array('f', bytes(4 * synth_size))
+                out = array.array('f', bytes(4 * chunk_size))
+                pcm = array.array('h', bytes(2 * chunk_size))
+            if NUMBA_AVAILABLE:
+                _render_chunk(synth, 0.0, 0.0, 0.0, 0.0, lfo_step, self._noise,
+                              self._burble_gate, 0, 0.0, 0.0)  # Compile before playback starts
+            vectorized = NUMPY_AVAILABLE and not NUMBA_AVAILABLE  # Compiled renderer wins when present
             
             while self.playing:
                 # Smooth RPM changes for audio
-                if abs(self.rpm - self.target_rpm) > 10:
-                    if self.rpm < self.target_rpm:
-                        self.rpm = min(self.target_rpm, self.rpm + 30)
-                    else:
-                        self.rpm = max(self.target_rpm, self.rpm - 30)
-                else:
-                    self.rpm = self.target_rpm
+                start_rpm = self.rpm
+                self.rpm += rpm_alpha * (self.target_rpm - self.rpm)
                 
                 # Calculate frequencies based on RPM
-                # 4-cylinder fires twice per revolution
-                firing_freq = (self.rpm / 60.0) * 2.0  # Firing frequency in Hz
-                base_freq = firing_freq  # Base frequency matches firing rate
+                # 4-cylinder fires twice per revolution, so the firing frequency
+                # in Hz is rpm / 60 * 2 - glided from start_rpm to self.rpm
+                cycle_step = (start_rpm / 30.0) / synth_rate
+                step_delta = ((self.rpm - start_rpm) / 30.0) / synth_rate / synth_size
                 
                 # RPM-dependent characteristics
-                rpm_ratio = self.rpm / 7200.0  # 0.0 to 1.0
+                rpm_ratio = (start_rpm + self.rpm) * 0.5 * self.rpm_scale  # 0.0 to 1.0
                 
                 # Generate audio chunk
-                audio_data = []
-                for i in range(chunk_size):
-                    t = phase / sample_rate
-                    
-                    # 1. COMBUSTION EXPLOSIONS - sharp, percussive
-                    # Use pulse train for individual cylinder firings
-                    explosion_t = t * firing_freq
-                    explosion_cycle = explosion_t - math.floor(explosion_t)
-                    
-                    # Sharp attack, quick decay (explosion characteristic)
-                    # More pronounced at lower RPMs, crisper at high RPMs
-                    explosion_strength = 0.48 * (1.0 - rpm_ratio * 0.25)
-                    if explosion_cycle < 0.10:
-                        # Sharper attack with more aggressive decay
-                        explosion = (math.exp(-explosion_cycle * 30) * 
-                                   (math.sin(2 * math.pi * base_freq * 3 * t) + 
-                                    0.35 * math.sin(2 * math.pi * base_freq * 5 * t) +
-                                    0.15 * math.sin(2 * math.pi * base_freq * 7 * t)))
-                        explosion *= explosion_strength
-                    else:
-                        explosion = 0
-                    
-                    # 2. EXHAUST NOTE - raspy, with harmonics
-                    # Dominant component, varies with RPM
-                    exhaust_fundamental = 0.40 * math.sin(2 * math.pi * base_freq * t)
-                    exhaust_2nd = 0.24 * math.sin(2 * math.pi * base_freq * 2 * t + 0.5)
-                    exhaust_3rd = 0.16 * math.sin(2 * math.pi * base_freq * 3 * t + 1.2)
-                    exhaust_4th = 0.10 * math.sin(2 * math.pi * base_freq * 4 * t + 0.8)
-                    exhaust_5th = 0.06 * math.sin(2 * math.pi * base_freq * 5 * t + 0.3)
-                    # Add phase modulation for more organic sound
-                    phase_mod = 0.06 * math.sin(2 * math.pi * 2.3 * t)
-                    exhaust_note = (exhaust_fundamental + exhaust_2nd + exhaust_3rd + exhaust_4th + exhaust_5th) * (1.0 + phase_mod)
-                    
-                    # 3. INTAKE SOUND - subtle whoosh at higher RPMs
-                    intake_freq = base_freq * 0.7
-                    # Increases with RPM, more pronounced at high revs
-                    intake_amount = 0.10 * (rpm_ratio ** 1.5)
-                    intake = intake_amount * (math.sin(2 * math.pi * intake_freq * t) + 
-                                             0.3 * math.sin(2 * math.pi * intake_freq * 1.5 * t))
-                    
-                    # 4. MECHANICAL NOISE - valvetrain, pistons
-                    # Higher frequency components, more present at high RPM
-                    mechanical_amount = 0.06 + (0.03 * rpm_ratio)
-                    mechanical = mechanical_amount * (math.sin(2 * math.pi * base_freq * 7 * t) + 
-                                                     0.7 * math.sin(2 * math.pi * base_freq * 11 * t) +
-                                                     0.4 * math.sin(2 * math.pi * base_freq * 13 * t))
-                    
-                    # 5. SUB-BASS RUMBLE - engine block vibrations
-                    rumble_freq = base_freq * 0.5
-                    # Stronger at lower RPMs, adds depth
-                    rumble_amount = 0.18 * (1.0 - rpm_ratio * 0.4)
-                    rumble = rumble_amount * (math.sin(2 * math.pi * rumble_freq * t) +
-                                             0.3 * math.sin(2 * math.pi * rumble_freq * 0.75 * t))
-                    
-                    # 6. ENGINE ROUGHNESS - combustion irregularities
-                    # More pronounced at lower RPMs (idle)
-                    roughness_amount = 0.14 * (1.0 - rpm_ratio * 0.65)
-                    roughness = (roughness_amount * 
-                               (math.sin(2 * math.pi * base_freq * 13.7 * t) * math.sin(2 * math.pi * 3.3 * t) +
-                                0.3 * math.sin(2 * math.pi * base_freq * 17.3 * t)))
-                    
-                    # 7. HIGH RPM RASP - screaming exhaust at high revs
-                    if rpm_ratio > 0.55:
-                        rasp_amount = ((rpm_ratio - 0.55) ** 1.3) * 0.6
-                        rasp = rasp_amount * 0.20 * (math.sin(2 * math.pi * base_freq * 5 * t) + 
-                                                     0.8 * math.sin(2 * math.pi * base_freq * 7 * t) +
-                                                     0.5 * math.sin(2 * math.pi * base_freq * 9 * t) +
-                                                     0.3 * math.sin(2 * math.pi * base_freq * 11 * t))
-                    else:
-                        rasp = 0
-                    
-                    # 8. BACKFIRE/BURBLE - occasional pops (especially mid-RPM)
-                    burble = 0
-                    if 0.35 < rpm_ratio < 0.82:
-                        burble_chance = math.sin(2 * math.pi * 0.7 * t) * math.sin(2 * math.pi * 13.1 * t)
-                        if burble_chance > 0.90:
-                            burble = 0.10 * math.exp(-explosion_cycle * 35) * (1.0 + 0.3 * math.sin(2 * math.pi * base_freq * 2 * t))
-                    
-                    # Combine all engine sounds
-                    sample = (explosion + exhaust_note + intake + mechanical + 
-                             rumble + roughness + rasp + burble) * self.volume
-                    
-                    # Soft clipping for more natural saturation
-                    sample = max(-1.0, min(1.0, sample))
-                    if abs(sample) > 0.8:
-                        sample = 0.8 * math.tanh(sample / 0.8)
-                    
-                    audio_data.append(sample)
-                    phase += 1
-                    explosion_phase += 1
-                    exhaust_phase += 1
+                if vectorized:
+                    self._synth_chunk_numpy(synth, cycle + cycle_step * ramp + step_delta * glide,
+                                            lfo_time + lfo_step * ramp,
+                                            (noise_pos + noise_ramp) % noise_len, rpm_ratio)
+                    cycle = (cycle + cycle_step * synth_size +
+                             step_delta * synth_size * (synth_size - 1) / 2) % ENGINE_PHASE_PERIOD
+                    lfo_time = (lfo_time + lfo_step * synth_size) % LFO_PERIOD
+                    noise_pos = (noise_pos + synth_size) % noise_len
+                else:
+                    cycle, lfo_time, noise_pos = _render_chunk(synth, cycle, cycle_step, step_delta,
+                                                               lfo_time, lfo_step,
+                                                               self._noise, self._burble_gate,
+                                                               noise_pos,
+                                                               rpm_ratio, self.volume)
+                last = _upsample_2x(out, synth, last)
+                
+                # Samples are already soft-clipped to [-1, 1]
+                if NUMPY_AVAILABLE:
+                    out *= 32767
+                    np.copyto(pcm, out, casting='unsafe')
+                else:
+                    for i, sample in enumerate(out):
+                        pcm[i] = int(sample * 32767)
                 
-                # Convert to bytes and play
-                audio_bytes = struct.pack('f' * len(audio_data), *audio_data)
-                self.stream.write(audio_bytes)
+                # Queue for playback (blocks while BUFFER_CHUNKS are waiting)
+                audio_bytes = pcm.tobytes()
+                while self.playing:
+                    try:
+                        self._chunks.put(audio_bytes, timeout=0.1)
+                        break
+                    except queue.Full:
+                        pass
         
         except Exception as e:
             print(f"Audio loop error: {e}")
             self.playing = False
+        finally:
+            # Close the stream on this thread so stop() never races a write
+            if self.stream:
+                try:
+                    self.stream.stop_stream()
+                    self.stream.close()
+                except:
+                    pass
+                self.stream = None
+    
+    def _pa_callback(self, in_data, frame_count, time_info, status):
+        """PortAudio callback - hands over the next rendered chunk, never waits."""
+        try:
+            return self._chunks.get_nowait(), pyaudio.paContinue
+        except queue.Empty:
+            return bytes(2 * frame_count), pyaudio.paContinue  # Underrun - play silence
+    
+    def _synth_chunk_numpy(self, out, cycles, lfo_time, noise_idx, rpm_ratio):
+        """Synthesize one chunk into out in a few whole-array passes, given each
+        sample's firing phase (cycles), modulator clock (lfo_time, seconds) and
+        position in the roughness noise and burble gate (noise_idx).
+        
+        Same engine model as _render_chunk. Every layer is one row of a
+        matrix: whole-harmonic layers are read from _WAVETABLES, then come the
+        _PARTIAL_RATIOS sines and the two roughness noise rows. Time-varying
+        envelopes scale their rows in place, then a single dot product with
+        the per-chunk gains mixes them.
+        """
+        w = (2 * math.pi) * cycles  # Fundamental phase (base freq = firing rate)
+        lfo = (2 * math.pi) * lfo_time
+        
+        # Position within the firing cycle drives the tables and the explosion envelope
+        explosion_cycle = cycles - np.floor(cycles)
+        idx = explosion_cycle * WAVETABLE_SIZE
+        lo = idx.astype(np.intp)
+        
+        partials = len(_WAVETABLES) + len(_PARTIAL_RATIOS)
+        layers = np.empty((partials + len(self._noise), len(w)))
+        waves = layers[:len(_WAVETABLES)]
+        np.take(_WAVETABLES, lo, axis=1, out=waves)
+        waves += (np.take(_WAVETABLES, lo + 1, axis=1) - waves) * (idx - lo)
+        np.sin(np.multiply.outer(_PARTIAL_RATIOS, w), out=layers[len(_WAVETABLES):partials])
+        layers[partials:] = self._noise[:, noise_idx]
+        explosion, exhaust_note, _, _, burble = waves
+        
+        # 1. COMBUSTION EXPLOSIONS - sharp attack for the first 10% of each firing
+        explosion *= np.exp(-30 * explosion_cycle) * (explosion_cycle < 0.10)
+        
+        # 2. EXHAUST NOTE - harmonics with slow phase modulation
+        exhaust_note *= 1.0 + 0.06 * np.sin(2.3 * lfo)
+        
+        # 7. HIGH RPM RASP
+        rasp_amount = ((rpm_ratio - 0.55) ** 1.3) * 0.6 * 0.20 if rpm_ratio > 0.55 else 0.0
+        
+        # 8. BACKFIRE/BURBLE - while a pop holds the gate open
+        burble_amount = 0.0
+        if 0.35 < rpm_ratio < 0.82:
+            gate = self._burble_gate[noise_idx]
+            if gate.any():
+                burble *= np.exp(-35 * explosion_cycle) * gate
+                burble_amount = 0.10
+        
+        intake_amount = 0.10 * (rpm_ratio ** 1.5)
+        rumble_amount = 0.18 * (1.0 - rpm_ratio * 0.4)
+        roughness_amount = 0.14 * (1.0 - rpm_ratio * 0.65)
+        brightness = min(1.0, rpm_ratio)
+        gains = np.array([
+            0.48 * (1.0 - rpm_ratio * 0.25),                # Explosion
+            1.0,                                            # Exhaust note
+            0.06 + 0.03 * rpm_ratio,                        # Mechanical noise
+            rasp_amount,                                    # Rasp
+            burble_amount,                                  # Burble
+            intake_amount, 0.3 * intake_amount,             # Intake (0.7x, 1.05x)
+            rumble_amount, 0.3 * rumble_amount,             # Rumble (0.5x, 0.375x)
+            roughness_amount * (1.0 - brightness),          # Roughness (dark noise)
+            roughness_amount * brightness,                  # Roughness (bright noise)
+        ])
+        sample = gains @ layers
+        
+        sample *= self.volume
+        
+        # Soft clipping for more natural saturation (same Pade tanh as _render_chunk)
+        np.clip(sample, -1.0, 1.0, out=sample)
+        loud = np.abs(sample) > 0.8
+        if loud.any():
+            x = sample[loud] / 0.8
+            x2 = x * x
+            sample[loud] = 0.8 * x * (945.0 + x2 * (105.0 + x2)) / (945.0 + x2 * (420.0 + 15.0 * x2))
+        
+        out[:] = sample
     
     def _sawtooth(self, t):
         """Generate sawtooth wave (more engine-like than sine)."""
@@ -410,6 +773,17 @@ class AudioEngine:
 class CarConfig:
     """Handles loading and storing car configuration from JSON files."""
     
+    __slots__ = (
+        'name', 'year', 'make', 'model',
+        'redline_rpm', 'idle_rpm', 'shift_light_rpm', 'min_display_rpm', 'max_display_rpm', 'stall_rpm',
+        'transmission_type', 'gears', 'gear_ratios', 'final_drive', 'clutch_engagement_rpm',
+        'tire_circumference', 'top_speed_kmh', 'gear_speed_limits',
+        'rpm_accel_rate', 'rpm_decel_rate', 'rpm_idle_return_rate',
+        'speed_accel_rate', 'speed_decel_rate', 'drag_coefficient', 'rolling_resistance',
+        'filepath', 'filename',
+        '_rpm_per_kmh', '_min_speed_kmh',
+    )
+    
     def __init__(self, filepath=None):
         """Load car configuration from JSON file."""
         if filepath:
@@ -449,7 +823,7 @@ class CarConfig:
         # Transmission
         self.transmission_type = "manual"
         self.gears = 6
-        self.gear_ratios = {1: 3.760, 2: 2.269, 3: 1.645, 4: 1.187, 5: 1.000, 6: 0.843}
+        self.gear_ratios = (0.0, 3.760, 2.269, 1.645, 1.187, 1.000, 0.843)  # Indexed by gear (0 = neutral)
         self.final_drive = 4.100
         self.clutch_engagement_rpm = 1200
         
@@ -458,15 +832,16 @@ class CarConfig:
         
         # Performance
         self.top_speed_kmh = 215
-        # Speed limits per gear (realistic for MX-5 NC)
-        self.gear_speed_limits = {
-            1: 50,   # 1st gear: 50 km/h
-            2: 85,   # 2nd gear: 85 km/h
-            3: 120,  # 3rd gear: 120 km/h
-            4: 160,  # 4th gear: 160 km/h
-            5: 200,  # 5th gear: 200 km/h
-            6: 215   # 6th gear: top speed
-        }
+        # Speed limits per gear (realistic for MX-5 NC), indexed by gear
+        self.gear_speed_limits = (
+            0,
+            50,   # 1st gear: 50 km/h
+            85,   # 2nd gear: 85 km/h
+            120,  # 3rd gear: 120 km/h
+            160,  # 4th gear: 160 km/h
+            200,  # 5th gear: 200 km/h
+            215   # 6th gear: top speed
+        )
         
         # Physics
         self.rpm_accel_rate = 50
@@ -479,6 +854,7 @@ class CarConfig:
         
         self.filepath = None
         self.filename = "Default Configuration"
+        self._derive_gear_factors()
     
     def _parse_config(self, data):
         """Parse JSON data into configuration attributes."""
@@ -500,8 +876,9 @@ class CarConfig:
         trans = data.get('transmission', {})
         self.transmission_type = trans.get('type', 'manual')
         self.gears = trans.get('gears', 6)
-        gear_ratios_raw = trans.get('gear_ratios', {})
-        self.gear_ratios = {int(k): float(v) for k, v in gear_ratios_raw.items()}
+        gear_ratios_raw = {int(k): float(v) for k, v in trans.get('gear_ratios', {}).items()}
+        # Tuple indexed by gear (0 = neutral) - a missing ratio fails here, not mid-drive
+        self.gear_ratios = (0.0,) + tuple(gear_ratios_raw[g] for g in range(1, self.gears + 1))
         self.final_drive = trans.get('final_drive', 4.100)
         self.clutch_engagement_rpm = trans.get('clutch_engagement_rpm', 1200)
         
@@ -516,10 +893,13 @@ class CarConfig:
         # Gear speed limits
         gear_limits_raw = perf.get('gear_speed_limits', {})
         if gear_limits_raw:
-            self.gear_speed_limits = {int(k): float(v) for k, v in gear_limits_raw.items()}
+            gear_limits = {int(k): float(v) for k, v in gear_limits_raw.items()}
         else:
             # Default limits if not specified
-            self.gear_speed_limits = {1: 50, 2: 85, 3: 120, 4: 160, 5: 200, 6: 215}
+            gear_limits = {1: 50, 2: 85, 3: 120, 4: 160, 5: 200, 6: 215}
+        # Tuple indexed by gear; gears without a limit run to top speed
+        self.gear_speed_limits = (0,) + tuple(gear_limits.get(g, self.top_speed_kmh)
+                                              for g in range(1, self.gears + 1))
         
         # Physics
         physics = data.get('physics', {})
@@ -530,6 +910,16 @@ class CarConfig:
         self.speed_decel_rate = physics.get('speed_decel_rate', 1.0)
         self.drag_coefficient = physics.get('drag_coefficient', 0.00005)
         self.rolling_resistance = physics.get('rolling_resistance', 0.009)
+        self._derive_gear_factors()
+    
+    def _derive_gear_factors(self):
+        """Precompute the per-gear speed<->RPM factors used every physics tick."""
+        # Engine RPM per km/h: (km/h -> m/s -> wheel RPM) * gear ratio * final drive
+        self._rpm_per_kmh = tuple(ratio * self.final_drive * 60 / (3.6 * self.tire_circumference)
+                                  for ratio in self.gear_ratios)
+        # Slowest speed each gear can hold at clutch engagement RPM (0 in neutral)
+        self._min_speed_kmh = (0,) + tuple(self.clutch_engagement_rpm / factor
+                                           for factor in self._rpm_per_kmh[1:])
 
 # ============================================================================
 # LED State Logic (matching Arduino mirrored progress bar system)
@@ -558,98 +948,138 @@ def is_state_5(rpm):
     """Check if RPM is in State 5 (Rev Limit Cut)."""
     return rpm >= STATE_5_RPM_MIN
 
+STATE_OFF = -1  # RPM outside every state range (all LEDs off)
+
+def _build_rpm_state_lut():
+    """
+    Classify every whole RPM from 0 to STATE_5_RPM_MIN once, using the
+    Arduino's priority order (State 5 > 4 > 3 > 1 > 2).
+    """
+    global _RPM_STATE_LUT
+    lut = []
+    for rpm in range(STATE_5_RPM_MIN + 1):
+        if is_state_5(rpm):
+            lut.append(5)
+        elif is_state_4(rpm):
+            lut.append(4)
+        elif is_state_3(rpm):
+            lut.append(3)
+        elif is_state_1(rpm):
+            lut.append(1)
+        elif is_state_2(rpm):
+            lut.append(2)
+        else:
+            lut.append(STATE_OFF)
+    _RPM_STATE_LUT = tuple(lut)
+
+_build_rpm_state_lut()
+
+def classify_rpm_state(rpm):
+    """RPM-based LED state (1-5, or STATE_OFF) - one table lookup."""
+    return _RPM_STATE_LUT[min(max(int(rpm), 0), STATE_5_RPM_MIN)]
+
+# Distance of each LED from its nearest strip end (0 at both edges) - every
+# mirrored pattern is a threshold on it, with no per-side branching
+_EDGE_DIST = tuple(min(i, LED_COUNT - 1 - i) for i in range(LED_COUNT))
+
 def get_pulse_brightness(current_time_ms, period, min_bright, max_bright):
-    """Calculate pulsing brightness."""
-    phase = (current_time_ms % period) / period
-    angle = phase * 2.0 * math.pi
-    sine_value = (math.sin(angle) + 1.0) / 2.0  # Normalize to 0.0 to 1.0
-    brightness = min_bright + sine_value * (max_bright - min_bright)
-    return int(brightness)
+    """Calculate pulsing brightness (one table lookup - see _pulse_table)."""
+    return _pulse_table(period, min_bright, max_bright)[int(current_time_ms % period)]
+
+@lru_cache(maxsize=8)
+def _pulse_table(period, min_bright, max_bright):
+    """Pulse brightness for every millisecond of one period."""
+    table = []
+    for ms in range(period):
+        angle = ms / period * 2.0 * math.pi
+        sine_value = (math.sin(angle) + 1.0) / 2.0  # Normalize to 0.0 to 1.0
+        table.append(int(min_bright + sine_value * (max_bright - min_bright)))
+    return tuple(table)
+
+# Two hex digits for every 0-255 channel value
+_HEX = tuple(f'{i:02x}' for i in range(256))
+
+def rgb_to_hex(rgb):
+    """Tk color string ('#rrggbb') for an RGB tuple."""
+    return '#' + _HEX[rgb[0]] + _HEX[rgb[1]] + _HEX[rgb[2]]
+
+@lru_cache(maxsize=1024)
+def led_palette(rgb, gradient_steps):
+    """
+    Canvas colors for a lit LED: (glow, dim glow, gradient bands top first,
+    border, number, number shadow). Cached per color - a strip only ever
+    shows a handful.
+    """
+    glow_color = rgb_to_hex([min(255, c + 40) for c in rgb])
+    dim_glow = rgb_to_hex([int(c * 0.3) for c in rgb])
+    # Brightness decreases from top to bottom
+    gradient_colors = tuple(rgb_to_hex([min(255, int(c * (1.5 - step * 0.15))) for c in rgb])
+                            for step in range(gradient_steps))
+    border_color = rgb_to_hex([min(255, c + 50) for c in rgb])
+    # LED number - dark text with a light shadow on bright LEDs, the reverse
+    # on dim/medium ones (no alpha support in Tkinter)
+    text_color, shadow_color = ("#000000", "#ffffff") if sum(rgb) > 400 else ("#ffffff", "#000000")
+    return glow_color, dim_glow, gradient_colors, border_color, text_color, shadow_color
 
 def scale_color(color, brightness):
     """Scale an RGB color by brightness (0-255)."""
-    return tuple(int(c * brightness / 255) for c in color)
-
-def draw_mirrored_bar(leds_per_side, color):
-    """Draw mirrored bar from edges inward."""
-    pattern = []
-    for i in range(LED_COUNT):
-        if i < LED_COUNT // 2:
-            # Left side: lit from edge inward
-            is_lit = (i < leds_per_side)
-        else:
-            # Right side: lit from edge inward
-            is_lit = (i >= (LED_COUNT - leds_per_side))
-        
-        if is_lit:
-            pattern.append(color)
-        else:
-            pattern.append((0, 0, 0))
-    
-    return pattern
+    return tuple(c * brightness // 255 for c in color)
+
+@lru_cache(maxsize=256)
+def draw_solid_strip(color):
+    """
+    Fill the whole strip with one color.
+    Cached per color - returns a shared tuple, don't modify.
+    """
+    return (color,) * LED_COUNT
+
+@lru_cache(maxsize=256)
+def draw_mirrored_bar(leds_per_side, color, background=(0, 0, 0)):
+    """
+    Draw mirrored bar from edges inward over background.
+    Cached per arguments - returns a shared tuple, don't modify.
+    """
+    # An LED is in the bar when it is within leds_per_side of either edge
+    return tuple(color if d < leds_per_side else background for d in _EDGE_DIST)
 
 def get_state_0_pattern(pepper_position):
     """
     State 0: Idle/Neutral - White pepper inward from edges.
-    Returns list of RGB tuples for all LEDs.
+    Returns tuple of RGB tuples for all LEDs (cached, see draw_mirrored_bar).
     """
-    pattern = []
     # Use maximum brightness for debugging - ensure LEDs are visible!
     bright_white = (255, 255, 255)  # Full brightness white
     
-    for i in range(LED_COUNT):
-        # Calculate distance from nearest edge (0 for edge LEDs, increases toward center)
-        if i < LED_COUNT // 2:
-            distance_from_edge = i  # Left side: 0, 1, 2, ...
-        else:
-            distance_from_edge = LED_COUNT - 1 - i  # Right side: ..., 2, 1, 0
-        
-        # Light up LEDs from edge inward up to pepper_position
-        # Cap at half the strip (center point) - during hold time, keep all lit
-        max_position = LED_COUNT // 2 - 1  # 14 for 30 LEDs (reaches center)
-        
-        if pepper_position <= max_position:
-            # Animation in progress - light up based on distance
-            if distance_from_edge <= pepper_position:
-                pattern.append(bright_white)
-            else:
-                pattern.append((0, 0, 0))
-        else:
-            # Hold time - keep entire strip lit
-            pattern.append(bright_white)
+    # Cap at half the strip (center point) - during hold time, keep all lit
+    max_position = LED_COUNT // 2 - 1  # 14 for 30 LEDs (reaches center)
     
-    return pattern
+    # Light up LEDs from edge inward up to pepper_position
+    return draw_mirrored_bar(min(pepper_position, max_position) + 1, bright_white)
 
 def get_state_1_pattern():
     """
     State 1: Gas Efficiency Zone - Steady green on outermost LEDs.
-    Returns list of RGB tuples for all LEDs.
+    Returns tuple of RGB tuples for all LEDs (cached, see draw_mirrored_bar).
     """
-    pattern = []
-    for i in range(LED_COUNT):
-        if i < STATE_1_LEDS_PER_SIDE or i >= (LED_COUNT - STATE_1_LEDS_PER_SIDE):
-            pattern.append(STATE_1_COLOR)
-        else:
-            pattern.append((0, 0, 0))
-    
-    return pattern
+    return draw_mirrored_bar(STATE_1_LEDS_PER_SIDE, STATE_1_COLOR)
 
 def get_state_2_pattern(current_time_ms):
     """
     State 2: Stall Danger - Orange pulse outward.
-    Returns list of RGB tuples for all LEDs.
+    Returns tuple of RGB tuples for all LEDs (cached, see draw_solid_strip).
     """
     brightness = get_pulse_brightness(current_time_ms, STATE_2_PULSE_PERIOD, 
                                       STATE_2_MIN_BRIGHTNESS, STATE_2_MAX_BRIGHTNESS)
     scaled_color = scale_color(STATE_2_COLOR, brightness)
     
-    # All LEDs pulsing orange
-    return [scaled_color] * LED_COUNT
+    # All LEDs pulsing orange - brightness is a whole 0-255 level, so the
+    # pulse only ever produces a few hundred distinct strips
+    return draw_solid_strip(scaled_color)
 
 def get_state_3_pattern(rpm):
     """
     State 3: Normal Driving - Yellow mirrored bar growing inward.
-    Returns list of RGB tuples for all LEDs.
+    Returns tuple of RGB tuples for all LEDs (cached, see draw_mirrored_bar).
     """
     # Calculate position within State 3 range (0.0 to 1.0)
     position = (rpm - STATE_3_RPM_MIN) / (STATE_3_RPM_MAX - STATE_3_RPM_MIN)
@@ -663,7 +1093,7 @@ def get_state_3_pattern(rpm):
 def get_state_4_pattern(rpm, flash_state):
     """
     State 4: High RPM/Shift - Red bars with flashing gap in center.
-    Returns list of RGB tuples for all LEDs.
+    Returns tuple of RGB tuples for all LEDs (cached, see draw_mirrored_bar).
     """
     # Calculate position within State 4 range (0.0 to 1.0)
     position = (rpm - STATE_4_RPM_MIN) / (STATE_4_RPM_MAX - STATE_4_RPM_MIN)
@@ -672,62 +1102,57 @@ def get_state_4_pattern(rpm, flash_state):
     # Calculate how many LEDs per side should be lit (red bars)
     leds_per_side = int(position * (LED_COUNT // 2))
     
-    pattern = []
-    for i in range(LED_COUNT):
-        if i < LED_COUNT // 2:
-            # Left side: red bar from edge inward
-            is_in_bar = (i < leds_per_side)
-        else:
-            # Right side: red bar from edge inward
-            is_in_bar = (i >= (LED_COUNT - leds_per_side))
-        
-        if is_in_bar:
-            # Red bar
-            pattern.append(STATE_4_BAR_COLOR)
-        else:
-            # Flashing gap in center
-            if flash_state:
-                pattern.append(STATE_4_FLASH_1_COLOR)
-            else:
-                pattern.append(STATE_4_FLASH_2_COLOR)
-    
-    return pattern
+    # Red bars with the flashing gap in center as background
+    gap_color = STATE_4_FLASH_1_COLOR if flash_state else STATE_4_FLASH_2_COLOR
+    return draw_mirrored_bar(leds_per_side, STATE_4_BAR_COLOR, gap_color)
 
 def get_state_5_pattern():
     """
     State 5: Rev Limit Cut - Solid red strip.
-    Returns list of RGB tuples for all LEDs.
+    Returns tuple of RGB tuples for all LEDs (cached, see draw_solid_strip).
     """
-    return [STATE_5_COLOR] * LED_COUNT
+    return draw_solid_strip(STATE_5_COLOR)
 
 def get_error_pattern(pepper_position):
     """
     Error State: CAN Error - Red pepper inward from edges.
-    Returns list of RGB tuples for all LEDs.
+    Returns tuple of RGB tuples for all LEDs (cached, see draw_mirrored_bar).
     """
-    pattern = []
-    for i in range(LED_COUNT):
-        distance_from_edge = min(i, LED_COUNT - 1 - i)
-        
-        if distance_from_edge <= pepper_position and pepper_position < (LED_COUNT // 2):
-            # Light up this LED with red
-            pattern.append(ERROR_COLOR)
-        else:
-            pattern.append((0, 0, 0))
+    if pepper_position >= LED_COUNT // 2:
+        return draw_solid_strip((0, 0, 0))
     
-    return pattern
+    # Light up LEDs with red from edge inward up to pepper_position
+    return draw_mirrored_bar(pepper_position + 1, ERROR_COLOR)
+
+# Pattern for each LED state, given the simulator - indexed by state number,
+# so STATE_OFF (-1) picks the final all-off entry
+_STATE_PATTERNS = (
+    lambda sim: get_state_0_pattern(sim.pepper_position),
+    lambda sim: get_state_1_pattern(),
+    lambda sim: get_state_2_pattern(sim.current_time_ms),
+    lambda sim: get_state_3_pattern(sim.rpm),
+    lambda sim: get_state_4_pattern(sim.rpm, sim.flash_state),
+    lambda sim: get_state_5_pattern(),
+    lambda sim: draw_solid_strip((0, 0, 0)),  # STATE_OFF - below every range
+)
+
+# State indicator label color when each state is active
+STATE_INDICATOR_COLORS = (
+    "#00ff00",  # State 0: Idle
+    "#00ff00",  # State 1: Efficiency
+    "#ff8800",  # State 2: Stall
+    "#ffff00",  # State 3: Normal
+    "#ff0000",  # State 4: Shift
+    "#ff0000",  # State 5: Rev Limit
+)
 
 # ============================================================================
 # Physics Simulation
 # ============================================================================
 def calculate_rpm_from_speed(speed_kmh, gear, config):
     """Calculate RPM based on vehicle speed and gear."""
-    if gear == 0 or speed_kmh == 0:
-        return config.idle_rpm
-    
-    speed_ms = speed_kmh / 3.6  # Convert to m/s
-    wheel_rpm = (speed_ms * 60) / config.tire_circumference
-    engine_rpm = wheel_rpm * config.gear_ratios[gear] * config.final_drive
+    # Neutral's factor is 0, so neutral and standstill both clamp to idle
+    engine_rpm = speed_kmh * config._rpm_per_kmh[gear]
     
     return max(config.idle_rpm, min(config.redline_rpm, int(engine_rpm)))
 
@@ -735,28 +1160,47 @@ def calculate_max_speed_for_gear(gear, config):
     """Get maximum speed allowed in a given gear."""
     if gear == 0:
         return 0
-    return config.gear_speed_limits.get(gear, config.top_speed_kmh)
+    return config.gear_speed_limits[gear]
 
 def calculate_min_speed_for_gear(gear, config):
-    """Calculate minimum speed to avoid stalling in a given gear."""
-    # Neutral (gear 0) has no minimum speed
-    if gear == 0:
-        return 0
-    
-    # Minimum RPM to avoid stall is clutch engagement RPM
-    min_rpm = config.clutch_engagement_rpm
-    
-    # Reverse calculation: RPM -> Speed
-    wheel_rpm = min_rpm / (config.gear_ratios[gear] * config.final_drive)
-    speed_ms = (wheel_rpm * config.tire_circumference) / 60
-    speed_kmh = speed_ms * 3.6
-    
-    return speed_kmh
+    """Calculate minimum speed to avoid stalling in a given gear (precomputed per car)."""
+    return config._min_speed_kmh[gear]
+
+# ============================================================================
+# Frame Scheduling
+# ============================================================================
+FRAME_INTERVAL = 1 / 60  # seconds (60 FPS)
+
+def next_frame_delay(deadline, interval):
+    """
+    Advance a frame deadline by one interval so slow frames don't accumulate
+    drift; if we fall a whole frame behind, drop it and resync.
+    Returns (new deadline, after() delay in ms).
+    """
+    now = time.monotonic()
+    deadline += interval
+    if now > deadline + interval:
+        deadline = now + interval
+    return deadline, max(1, int((deadline - now) * 1000))
 
 # ============================================================================
 # Main Simulator Class
 # ============================================================================
 class LEDSimulator:
+    MAX_CONSOLE_LINES = 5000  # Older debug console lines are trimmed past this
+    
+    # LED strip geometry on led_canvas - sized to fit all LEDs
+    LED_WIDTH = 32
+    LED_HEIGHT = 55
+    LED_SPACING = 5
+    LED_START_X = 20
+    LED_START_Y = 10
+    LED_GRADIENT_STEPS = 5
+    
+    # Gauge geometry on the 280x280 gauge canvases
+    GAUGE_CENTER = (140, 140)
+    GAUGE_RADIUS = 110
+    
     def __init__(self, root):
         self.root = root
         self.root.title("MX5-Telemetry LED Simulator v2.1 - Three-State System")
@@ -814,10 +1258,12 @@ class LEDSimulator:
         self.engine_stop_frames = 0  # Frames remaining in stop animation
         
         # LED animation state (for mirrored progress bar system)
-        self.start_time_ms = 0  # Simulation start time in milliseconds
+        self.start_time_ns = None  # Monotonic simulation start, set on the first frame
         self.current_time_ms = 0  # Current simulation time in milliseconds
+        self._next_deadline = time.monotonic()  # When the next frame is due
         self.pepper_position = 3  # Position for inward pepper animations - start at 3 for visibility
         self.flash_state = False  # Flash state for State 4 gap flashing
+        self._indicator_state = STATE_OFF  # State whose indicator label is lit
         self.last_animation_update = 0  # Last time animation was updated
         
         # Arduino connection
@@ -827,6 +1273,22 @@ class LEDSimulator:
         self.last_led_send_time = 0  # Track last LED data send time (throttle to 20 Hz)
         self.current_led_pattern = [(0, 0, 0)] * LED_COUNT  # Store current LED colors for Arduino sync
         
+        # Serial I/O thread state (Tk thread -> _serial_io_loop -> Tk thread)
+        self._serial_out = queue.Queue()  # Command payloads waiting to be written
+        self._serial_error = None  # Write error for the Tk thread to act on
+        
+        # Set by on_close - scheduled callbacks and the port scanner stop on it
+        self._closing = threading.Event()
+        
+        # Serial port scanner state (scan thread -> Tk thread)
+        self._port_queue = queue.Queue()
+        self._port_rescan = threading.Event()
+        self._shown_ports = None  # Port list currently in the dropdown
+        self._port_usb_ids = {}   # Device -> (vid, pid) from the last scan
+        
+        # Debug console lines waiting to be written (flushed in batches by _flush_console)
+        self._console_queue = deque(maxlen=self.MAX_CONSOLE_LINES)
+        
         # Create UI
         self.create_ui()
         
@@ -840,6 +1302,15 @@ class LEDSimulator:
         
         # Start simulation loop
         self.update_simulation()
+        
+        # Start console flush pump
+        self._flush_console()
+        
+        # Enumerate serial ports off the Tk thread - comports() can take
+        # seconds on Windows while it walks SetupAPI
+        if SERIAL_AVAILABLE:
+            threading.Thread(target=self._port_scan_loop, daemon=True).start()
+            self._drain_port_queue()
     
     def create_ui(self):
         """Create the user interface."""
@@ -927,8 +1398,9 @@ class LEDSimulator:
                                                    font=("Arial", 8), fg="#888888", bg="#2a2a2a")
             self.connection_status_label.pack()
             
-            # Initialize port list
-            self.refresh_ports()
+            self._port_widgets = (self.port_dropdown, self.refresh_ports_btn)
+            
+            # Port list is filled in by the background scanner (see _port_scan_loop)
         
         # Audio status and volume control
         audio_frame = tk.Frame(control_frame, bg="#2a2a2a")
@@ -996,6 +1468,7 @@ class LEDSimulator:
                                    highlightthickness=0, bd=0)
         self.led_canvas.config(width=1520, height=75)
         self.led_canvas.pack(padx=5, pady=5)
+        self._build_led_items()
         
         # Gauges frame
         gauges_frame = tk.Frame(self.root, bg="#1a1a1a")
@@ -1053,7 +1526,8 @@ class LEDSimulator:
                                                 bg="#0d0d0d", fg="#00ff00",
                                                 font=("Consolas", 9), wrap=tk.WORD,
                                                 state=tk.DISABLED, relief=tk.FLAT, bd=0,
-                                                highlightthickness=1, highlightbackground="#3a3a3a")
+                                                highlightthickness=1, highlightbackground="#3a3a3a",
+                                                undo=False, autoseparators=False, maxundo=0)  # Append-only log
         self.console.pack(pady=5, padx=10, fill=tk.BOTH, expand=True)
         
         # Console control buttons
@@ -1160,7 +1634,7 @@ class LEDSimulator:
         self.engine_btn.config(text="🟢 STOP ENGINE", bg="#00aa00")
         gear_text = "N" if self.gear == 0 else str(self.gear)
         self.gear_label.config(text=gear_text, fg="#00ff00")
-        self.audio_engine.start(self.car_config.idle_rpm)
+        self.audio_engine.start(self.car_config.idle_rpm, self.car_config.redline_rpm)
     
     def complete_engine_stop(self):
         """Complete the engine stop sequence."""
@@ -1183,32 +1657,65 @@ class LEDSimulator:
         self.use_mph = not self.use_mph
     
     def refresh_ports(self):
-        """Refresh the list of available serial ports."""
+        """Ask the port scanner for an immediate rescan."""
         if not SERIAL_AVAILABLE:
             return
-        
+        self._port_rescan.set()
+    
+    def _port_scan_loop(self):
+        """Background thread: enumerate serial ports every 5 s, post (device, vid, pid) changes."""
+        last_ports = None
+        while not self._closing.is_set():
+            if not self.arduino_connected:
+                try:
+                    # Arduino-like ports first so the default selection is the likely board
+                    ports = sorted(serial.tools.list_ports.comports(),
+                                   key=lambda port: not is_arduino_port(port))
+                    port_list = [(port.device, port.vid, port.pid) for port in ports]
+                    if port_list != last_ports:
+                        last_ports = port_list
+                        self._port_queue.put(port_list)
+                except Exception as e:
+                    print(f"Error refreshing ports: {e}")
+            self._port_rescan.wait(5.0)
+            self._port_rescan.clear()
+    
+    def _drain_port_queue(self):
+        """Apply the newest port list posted by the scanner (Tk thread)."""
+        if self._closing.is_set():
+            return
+        port_list = None
         try:
-            ports = serial.tools.list_ports.comports()
-            port_list = [port.device for port in ports]
-            
-            if not port_list:
-                port_list = ["No ports found"]
-            
-            # Update dropdown menu
-            menu = self.port_dropdown["menu"]
-            menu.delete(0, "end")
-            
-            for port in port_list:
-                menu.add_command(label=port, 
-                               command=lambda value=port: self.port_var.set(value))
-            
-            # Set first port as default
-            if port_list and port_list[0] != "No ports found":
+            while True:
+                port_list = self._port_queue.get_nowait()
+        except queue.Empty:
+            pass
+        if port_list is not None:
+            self._port_usb_ids = {device: (vid, pid) for device, vid, pid in port_list}
+            self._set_port_list([device for device, _, _ in port_list])
+        self.root.after(200, self._drain_port_queue)
+    
+    def _set_port_list(self, port_list):
+        """Rebuild the port dropdown from an enumerated port list."""
+        if not port_list:
+            port_list = ["No ports found"]
+        if port_list == self._shown_ports:
+            return  # Menu already shows this list - skip the rebuild
+        self._shown_ports = port_list
+        
+        # Update dropdown menu
+        menu = self.port_dropdown["menu"]
+        menu.delete(0, "end")
+        
+        for port in port_list:
+            menu.add_command(label=port, command=partial(self.port_var.set, port))
+        
+        # Keep the user's pick if it is still plugged in, else default to the first port
+        if self.port_var.get() not in port_list:
+            if port_list[0] != "No ports found":
                 self.port_var.set(port_list[0])
             else:
                 self.port_var.set("")
-        except Exception as e:
-            print(f"Error refreshing ports: {e}")
     
     def toggle_arduino_connection(self):
         """Connect or disconnect from Arduino."""
@@ -1222,8 +1729,7 @@ class LEDSimulator:
                     self.arduino_port.close()
                     self.arduino_port = None
                 self.arduino_connected = False
-                self.connect_btn.config(text="Connect", bg="#006600")
-                self.connection_status_label.config(text="⚪ Not Connected", fg="#888888")
+                self._set_connection_ui(False, "⚪ Not Connected", "#888888")
                 self.log_console("Arduino disconnected")
                 print("Disconnected from Arduino")
             except Exception as e:
@@ -1248,9 +1754,9 @@ class LEDSimulator:
                     xonxoff=False  # Disable software flow control
                 )
                 
-                # Wait for Arduino to initialize
-                import time
-                time.sleep(2)
+                # Wait for Arduino to initialize - only boards that reset on open
+                # need the full bootloader delay
+                time.sleep(2 if port_resets_on_open(self._port_usb_ids.get(port_name)) else 0.05)
                 
                 # Flush any startup messages
                 self.arduino_port.reset_input_buffer()
@@ -1258,8 +1764,13 @@ class LEDSimulator:
                 
                 self.arduino_connected = True
                 self.last_rpm_sent = -1  # Reset
-                self.connect_btn.config(text="Disconnect", bg="#aa0000")
-                self.connection_status_label.config(text="🟢 Connected", fg="#00ff00")
+                
+                # Writes and reads for this port run on their own thread
+                self._serial_out = queue.Queue()
+                self._serial_error = None
+                threading.Thread(target=self._serial_io_loop, args=(self.arduino_port,),
+                                 daemon=True).start()
+                self._set_connection_ui(True, "🟢 Connected", "#00ff00")
                 self.log_console(f"✓ Arduino connected on {port_name}")
                 print(f"Connected to Arduino on {port_name}")
             except Exception as e:
@@ -1267,16 +1778,63 @@ class LEDSimulator:
                 self.log_console(f"❌ Arduino connection failed: {e}")
                 print(f"Connection error: {e}")
     
+    def _set_connection_ui(self, connected, status_text, status_color):
+        """Apply the connected/disconnected state to the Arduino controls."""
+        if connected:
+            self.connect_btn.config(text="Disconnect", bg="#aa0000")
+        else:
+            self.connect_btn.config(text="Connect", bg="#006600")
+        self.connection_status_label.config(text=status_text, fg=status_color)
+        
+        # Port selection is locked while a port is open
+        state = tk.DISABLED if connected else tk.NORMAL
+        for widget in self._port_widgets:
+            widget.config(state=state)
+    
+    def send_commands_to_arduino(self, commands):
+        """Queue several newline-terminated commands for a single serial write."""
+        payload = "".join(f"{cmd}\n" for cmd in commands).encode('ascii')
+        self._serial_out.put(payload)
+    
+    def _serial_io_loop(self, port):
+        """
+        Background thread: write queued commands and log replies for one open
+        port, so flushes and reads never stall the Tk thread. A write error is
+        left in _serial_error for send_leds_to_arduino to act on.
+        """
+        while self.arduino_port is port and not self._closing.is_set():
+            try:
+                payload = self._serial_out.get(timeout=0.05)
+            except queue.Empty:
+                payload = None
+            try:
+                if payload:
+                    port.write(payload)
+                    port.flush()
+                
+                # Log any pending data from Arduino
+                self.read_arduino_data()
+            except Exception as e:
+                if self.arduino_port is port:
+                    self._serial_error = e
+                return
+    
     def send_leds_to_arduino(self, led_pattern):
         """Send RPM and speed data directly to Slave Arduino (same as Arduino Actions)."""
         if not self.arduino_connected or not self.arduino_port:
             return
         
-        # First, read any pending data from Arduino
-        self.read_arduino_data()
+        # The serial thread failed to write - disconnect here on the Tk thread
+        if self._serial_error is not None:
+            e, self._serial_error = self._serial_error, None
+            self.log_console(f"⚠️ Error sending commands to Arduino: {e}")
+            print(f"Error sending commands to Arduino: {e}")
+            self.arduino_connected = False
+            self._set_connection_ui(False, "❌ Connection Lost", "#ff0000")
+            self.log_console("❌ Arduino connection lost")
+            return
         
         # Rate limit to ~4 Hz (250ms between updates) to match Master→Slave protocol
-        import time
         current_time = time.time() * 1000  # milliseconds
         if current_time - self.last_led_send_time < 250:
             return  # Skip this update
@@ -1300,16 +1858,11 @@ class LEDSimulator:
             
             if values_changed or needs_keepalive:
                 # Always send both speed and RPM together for keep-alive
-                spd_cmd = f"SPD:{spd}\n"
-                self.arduino_port.write(spd_cmd.encode('utf-8'))
+                self.send_commands_to_arduino((f"SPD:{spd}", f"RPM:{rpm}"))
                 self._last_sent_spd = spd
-                
-                rpm_cmd = f"RPM:{rpm}\n"
-                self.arduino_port.write(rpm_cmd.encode('utf-8'))
                 self._last_sent_rpm = rpm
                 
                 self._last_keepalive = current_time
-                self.arduino_port.flush()
                 
                 # Log what we sent
                 self.log_console(f"→ TX: SPD:{spd} RPM:{rpm}")
@@ -1318,8 +1871,7 @@ class LEDSimulator:
             print(f"Error sending commands to Arduino: {e}")
             # Disconnect on error
             self.arduino_connected = False
-            self.connect_btn.config(text="Connect", bg="#006600")
-            self.connection_status_label.config(text="❌ Connection Lost", fg="#ff0000")
+            self._set_connection_ui(False, "❌ Connection Lost", "#ff0000")
             self.log_console("❌ Arduino connection lost")
     
     def read_arduino_data(self):
@@ -1332,10 +1884,9 @@ class LEDSimulator:
             if self.arduino_port.in_waiting > 0:
                 # Read all available data
                 data = self.arduino_port.read(self.arduino_port.in_waiting).decode('utf-8', errors='ignore')
-                # Split into lines and log each
-                for line in data.strip().split('\n'):
-                    if line.strip():
-                        self.log_console(f"← RX: {line.strip()}")
+                # Split into lines and log each (one strip per line)
+                for line in filter(None, map(str.strip, data.split('\n'))):
+                    self.log_console(f"← RX: {line}")
         except Exception as e:
             self.log_console(f"⚠️ Error reading from Arduino: {e}")
     
@@ -1388,12 +1939,38 @@ class LEDSimulator:
         self.audio_engine.stop()
     
     def draw_gauge(self, canvas, value, max_value, label, unit, color):
-        """Draw a circular gauge."""
+        """Draw a circular gauge - only the needle and readout change per frame."""
+        if getattr(canvas, '_gauge_key', None) != (max_value, label, unit):
+            self.build_gauge(canvas, max_value, label, unit)
+        
+        # Needle
+        center_x, center_y = self.GAUGE_CENTER
+        value_ratio = min(value / max_value, 1.0)
+        needle_angle = (value_ratio * 270 - 225)
+        needle_angle_rad = math.radians(needle_angle)
+        
+        needle_x = center_x + (self.GAUGE_RADIUS - 20) * math.cos(needle_angle_rad)
+        needle_y = center_y + (self.GAUGE_RADIUS - 20) * math.sin(needle_angle_rad)
+        
+        canvas.coords(canvas._needle_id, center_x, center_y, needle_x, needle_y)
+        if color != canvas._gauge_color:
+            canvas.itemconfigure(canvas._needle_id, fill=color)
+            canvas.itemconfigure(canvas._hub_id, outline=color)
+            canvas._gauge_color = color
+        
+        # Value
+        canvas.itemconfigure(canvas._value_text_id, text=f"{int(value)} {unit}", fill=color)
+    
+    def build_gauge(self, canvas, max_value, label, unit):
+        """
+        Create a gauge's canvas items - the static face once per scale, plus
+        the needle, hub and value text that draw_gauge moves and recolors.
+        """
         canvas.delete("all")
         
         # Gauge parameters
-        center_x, center_y = 140, 140
-        radius = 110
+        center_x, center_y = self.GAUGE_CENTER
+        radius = self.GAUGE_RADIUS
         
         # Background circle
         canvas.create_oval(center_x - radius, center_y - radius,
@@ -1413,18 +1990,16 @@ class LEDSimulator:
         
         # Tick marks
         for i in range(tick_count):
-            if is_rpm_gauge:
-                value_ratio = i / (tick_count - 1)
-            else:
-                value_ratio = i / (tick_count - 1)
+            value_ratio = i / (tick_count - 1)
             
             angle = (value_ratio * 270 - 225)  # -225 to 45 degrees
             angle_rad = math.radians(angle)
+            cos_a, sin_a = math.cos(angle_rad), math.sin(angle_rad)
             
-            start_x = center_x + (radius - 15) * math.cos(angle_rad)
-            start_y = center_y + (radius - 15) * math.sin(angle_rad)
-            end_x = center_x + (radius - 5) * math.cos(angle_rad)
-            end_y = center_y + (radius - 5) * math.sin(angle_rad)
+            start_x = center_x + (radius - 15) * cos_a
+            start_y = center_y + (radius - 15) * sin_a
+            end_x = center_x + (radius - 5) * cos_a
+            end_y = center_y + (radius - 5) * sin_a
             
             canvas.create_line(start_x, start_y, end_x, end_y, 
                              fill="#666666", width=2)
@@ -1435,216 +2010,175 @@ class LEDSimulator:
             else:
                 label_value = int(value_ratio * max_value)
             
-            label_x = center_x + (radius - 35) * math.cos(angle_rad)
-            label_y = center_y + (radius - 35) * math.sin(angle_rad)
+            label_x = center_x + (radius - 35) * cos_a
+            label_y = center_y + (radius - 35) * sin_a
             canvas.create_text(label_x, label_y, text=str(label_value), 
                              fill="#888888", font=("Arial", 9))
         
-        # Needle
-        value_ratio = min(value / max_value, 1.0)
-        needle_angle = (value_ratio * 270 - 225)
-        needle_angle_rad = math.radians(needle_angle)
-        
-        needle_x = center_x + (radius - 20) * math.cos(needle_angle_rad)
-        needle_y = center_y + (radius - 20) * math.sin(needle_angle_rad)
-        
-        canvas.create_line(center_x, center_y, needle_x, needle_y, 
-                          fill=color, width=4, arrow=tk.LAST, arrowshape=(10, 12, 5))
+        # Needle (placed by draw_gauge)
+        canvas._needle_id = canvas.create_line(center_x, center_y, center_x, center_y,
+                                               width=4, arrow=tk.LAST, arrowshape=(10, 12, 5))
         
         # Center circle
-        canvas.create_oval(center_x - 10, center_y - 10,
-                          center_x + 10, center_y + 10,
-                          fill="#555555", outline=color, width=2)
+        canvas._hub_id = canvas.create_oval(center_x - 10, center_y - 10,
+                                            center_x + 10, center_y + 10,
+                                            fill="#555555", width=2)
+        canvas._gauge_color = None
         
         # Label
         canvas.create_text(center_x, center_y + 55, text=label, 
                           fill="#ffffff", font=("Arial", 13, "bold"))
         
         # Value
-        canvas.create_text(center_x, center_y + 75, 
-                          text=f"{int(value)} {unit}", 
-                          fill=color, font=("Arial", 14, "bold"))
+        canvas._value_text_id = canvas.create_text(center_x, center_y + 75,
+                                                   font=("Arial", 14, "bold"))
+        canvas._gauge_key = (max_value, label, unit)
     
     def draw_leds(self):
         """Draw the LED strip using three-state system with modern visual effects."""
-        self.led_canvas.delete("all")
-        
-        # LED dimensions and spacing for modern look - optimized to fit 40 LEDs
-        led_width = 32
-        led_height = 55
-        led_spacing = 5
-        start_x = 20
-        start_y = 10
-        
         if not self.engine_running:
             # All LEDs off when engine is off - subtle gray with minimal border
             # BUT STILL update the pattern for Arduino sync!
-            self.current_led_pattern = [(0, 0, 0)] * LED_COUNT
-            
-            for i in range(LED_COUNT):
-                x = start_x + i * (led_width + led_spacing)
-                
-                # Outer glow (very subtle when off)
-                self.led_canvas.create_oval(x - 2, start_y - 2, 
-                                            x + led_width + 2, start_y + led_height + 2,
-                                            fill="#0d0d0d", outline="")
-                
-                # LED body (rounded rectangle effect)
-                self.led_canvas.create_rectangle(x, start_y, x + led_width, start_y + led_height,
-                                                fill="#1a1a1a", outline="#2a2a2a", width=1)
-                
-                # LED number (subtle)
-                self.led_canvas.create_text(x + led_width // 2, start_y + led_height // 2, 
-                                           text=str(i+1), fill="#333333", font=("Arial", 7))
+            self.current_led_pattern = draw_solid_strip((0, 0, 0))
+            self._paint_leds(self.current_led_pattern)
             return
         
         # Determine which state we're in and get the pattern
         # Priority order matches Arduino: State 0 > State 5 > State 4 > State 3 > State 1 > State 2
-        # State 0: Idle/Neutral (speed = 0)
-        if is_state_0(self.speed):
-            led_pattern = get_state_0_pattern(self.pepper_position)
-            active_state = "State 0 (Idle)"
-        # State 5: Rev Limit Cut (7200+ RPM)
-        elif is_state_5(self.rpm):
-            led_pattern = get_state_5_pattern()
-            active_state = "State 5 (Rev Limit)"
-        # State 4: High RPM / Shift Danger (4501-7199 RPM)
-        elif is_state_4(self.rpm):
-            led_pattern = get_state_4_pattern(self.rpm, self.flash_state)
-            active_state = "State 4 (Shift)"
-        # State 3: Normal Driving / Power Band (2501-4500 RPM)
-        elif is_state_3(self.rpm):
-            led_pattern = get_state_3_pattern(self.rpm)
-            active_state = "State 3 (Normal)"
-        # State 1: Gas Efficiency Zone (2000-2500 RPM)
-        elif is_state_1(self.rpm):
-            led_pattern = get_state_1_pattern()
-            active_state = "State 1 (Efficiency)"
-        # State 2: Stall Danger (750-1999 RPM)
-        elif is_state_2(self.rpm):
-            led_pattern = get_state_2_pattern(self.current_time_ms)
-            active_state = "State 2 (Stall)"
-        else:
-            # Below minimum RPM - all off
-            led_pattern = [(0, 0, 0)] * LED_COUNT
-            active_state = "Off"
+        # (speed = 0 overrides, classify_rpm_state resolves the rest)
+        state = 0 if is_state_0(self.speed) else classify_rpm_state(self.rpm)
+        led_pattern = _STATE_PATTERNS[state](self)
         
         # Store LED pattern for Arduino sync
         self.current_led_pattern = led_pattern
         
-        # Update state indicators at top
-        state_colors = ["#666666"] * 6  # Default: all gray
-        if active_state == "State 0 (Idle)":
-            state_colors[0] = "#00ff00"  # Green for Idle
-        elif active_state == "State 1 (Efficiency)":
-            state_colors[1] = "#00ff00"  # Green for Efficiency
-        elif active_state == "State 2 (Stall)":
-            state_colors[2] = "#ff8800"  # Orange for Stall
-        elif active_state == "State 3 (Normal)":
-            state_colors[3] = "#ffff00"  # Yellow for Normal
-        elif active_state == "State 4 (Shift)":
-            state_colors[4] = "#ff0000"  # Red for Shift
-        elif active_state == "State 5 (Rev Limit)":
-            state_colors[5] = "#ff0000"  # Red for Rev Limit
-        
-        for i, label in enumerate(self.state_labels):
-            label.config(fg=state_colors[i])
-        
-        # Draw all LEDs with modern visual effects
+        # Update state indicators at top - only the labels leaving and entering
+        # the active state change
+        if state != self._indicator_state:
+            if self._indicator_state != STATE_OFF:
+                self.state_labels[self._indicator_state].config(fg="#666666")
+            if state != STATE_OFF:
+                self.state_labels[state].config(fg=STATE_INDICATOR_COLORS[state])
+            self._indicator_state = state
+        
+        # Only LEDs whose color changed since the last frame touch the canvas
+        self._paint_leds(led_pattern)
+    
+    def _build_led_items(self):
+        """Create every LED strip canvas item once - draw_leds only reconfigures them."""
+        canvas = self.led_canvas
+        w, h, y = self.LED_WIDTH, self.LED_HEIGHT, self.LED_START_Y
+        
+        # Tags group each LED's glow ovals ("glow<i>", split into the two outer
+        # "dimglow<i>" and two inner "hotglow<i>" layers) and everything only a
+        # lit LED shows ("lit<i>"), so each group takes a single itemconfigure
+        self._led_glow_ids = []      # Per LED: glow ovals, outermost layer first
+        self._led_gradient_ids = []  # Per LED: image item showing its gradient
+        self._gradient_images = {}   # Gradient colors -> PhotoImage with the bands painted in
+        self._led_body_ids = []      # Gray body when off, border when lit
+        self._led_shadow_ids = []    # Number shadow (lit only)
+        self._led_text_ids = []      # LED number
+        self._led_last_color = [None] * LED_COUNT  # RGB each LED is drawn with
+        self._led_last_pattern = None  # Pattern object last painted
+        
         for i in range(LED_COUNT):
-            x = start_x + i * (led_width + led_spacing)
-            rgb = led_pattern[i]
-            
-            # Calculate brightness (0-1)
-            brightness = sum(rgb) / (255 * 3)
-            is_lit = sum(rgb) > 10
-            
-            if is_lit:
-                # LED is lit - create glow effect
-                color = f'#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}'
-                
-                # Create multiple glow layers for depth with improved visual effect
-                # Outer glow (largest, creates diffusion effect)
-                if brightness > 0.2:
-                    glow_color = f'#{min(255, rgb[0] + 40):02x}{min(255, rgb[1] + 40):02x}{min(255, rgb[2] + 40):02x}'
-                    dim_glow = f'#{int(rgb[0] * 0.3):02x}{int(rgb[1] * 0.3):02x}{int(rgb[2] * 0.3):02x}'
-                    
-                    # Multiple glow layers for realistic diffusion
-                    for layer in range(4, 0, -1):
-                        offset = int(layer * 2.5 * brightness)
-                        stipple_pattern = ["gray75", "gray50", "gray25", ""][4 - layer]
-                        
-                        self.led_canvas.create_oval(
-                            x - offset, start_y - offset,
-                            x + led_width + offset, start_y + led_height + offset,
-                            fill=dim_glow if layer > 2 else glow_color, 
-                            outline="", 
-                            stipple=stipple_pattern if stipple_pattern else ""
-                        )
-                
-                # Create smooth gradient effect with multiple bands
-                gradient_steps = 5
-                for step in range(gradient_steps):
-                    y_start = start_y + int((led_height / gradient_steps) * step)
-                    y_end = start_y + int((led_height / gradient_steps) * (step + 1))
-                    
-                    # Brightness decreases from top to bottom
-                    brightness_factor = 1.5 - (step * 0.15)
-                    gradient_rgb = tuple(min(255, int(c * brightness_factor)) for c in rgb)
-                    gradient_color = f'#{gradient_rgb[0]:02x}{gradient_rgb[1]:02x}{gradient_rgb[2]:02x}'
-                    
-                    self.led_canvas.create_rectangle(
-                        x, y_start, x + led_width, y_end,
-                        fill=gradient_color, outline=""
-                    )
-                
-                # Subtle border for definition
-                border_color = f'#{min(255, rgb[0] + 50):02x}{min(255, rgb[1] + 50):02x}{min(255, rgb[2] + 50):02x}'
-                self.led_canvas.create_rectangle(
-                    x, start_y, x + led_width, start_y + led_height,
-                    fill="", outline=border_color, width=1
-                )
-                
-                # LED number - adaptive color for readability
-                if sum(rgb) > 400:
-                    text_color = "#000000"  # Dark text on bright background
-                    shadow_color = "#ffffff"  # Light shadow on dark text
-                else:
-                    text_color = "#ffffff"  # White text on dim/medium background
-                    shadow_color = "#000000"  # Dark shadow on light text
-                
-                # Add text shadow for better readability (no alpha support in Tkinter)
-                shadow_offset = 1
-                self.led_canvas.create_text(
-                    x + led_width // 2 + shadow_offset, 
-                    start_y + led_height // 2 + shadow_offset,
-                    text=str(i+1), fill=shadow_color, font=("Arial", 7, "bold")
-                )
-                
-                self.led_canvas.create_text(
-                    x + led_width // 2, start_y + led_height // 2,
-                    text=str(i+1), fill=text_color, font=("Arial", 7, "bold")
-                )
-            else:
-                # LED is off - subtle gray
-                self.led_canvas.create_rectangle(
-                    x, start_y, x + led_width, start_y + led_height,
-                    fill="#1a1a1a", outline="#2a2a2a", width=1
-                )
-                
-                # LED number (subtle when off)
-                self.led_canvas.create_text(
-                    x + led_width // 2, start_y + led_height // 2,
-                    text=str(i+1), fill="#333333", font=("Arial", 7)
-                )
+            x = self.LED_START_X + i * (w + self.LED_SPACING)
+            self._led_glow_ids.append([
+                canvas.create_oval(x, y, x + w, y + h, outline="", stipple=stipple, state=tk.HIDDEN,
+                                   tags=(layer_tag + str(i), f"glow{i}", f"lit{i}"))
+                for stipple, layer_tag in (("gray75", "dimglow"), ("gray50", "dimglow"),
+                                           ("gray25", "hotglow"), ("", "hotglow"))
+            ])
+            self._led_gradient_ids.append(canvas.create_image(
+                x, y, anchor=tk.NW, state=tk.HIDDEN, tags=f"lit{i}"))
+            self._led_body_ids.append(canvas.create_rectangle(
+                x, y, x + w, y + h, fill="#1a1a1a", outline="#2a2a2a", width=1))
+            self._led_shadow_ids.append(canvas.create_text(
+                x + w // 2 + 1, y + h // 2 + 1,
+                text=str(i + 1), font=("Arial", 7, "bold"), state=tk.HIDDEN, tags=f"lit{i}"))
+            self._led_text_ids.append(canvas.create_text(
+                x + w // 2, y + h // 2, text=str(i + 1), fill="#333333", font=("Arial", 7)))
+    
+    def _paint_leds(self, led_pattern):
+        """Reconfigure the canvas items of every LED whose color changed."""
+        # Patterns are shared cached tuples - the same object means the same strip
+        if led_pattern is self._led_last_pattern:
+            return
+        self._led_last_pattern = led_pattern
+        
+        last_color = self._led_last_color
+        for i, rgb in enumerate(led_pattern):
+            if rgb != last_color[i]:
+                self._paint_led(i, rgb)
+                last_color[i] = rgb
+    
+    def _gradient_image(self, gradient_colors):
+        """PhotoImage of an LED face with its gradient bands, shared by every LED showing them."""
+        image = self._gradient_images.get(gradient_colors)
+        if image is None:
+            w, h = self.LED_WIDTH, self.LED_HEIGHT
+            band = h / self.LED_GRADIENT_STEPS
+            image = tk.PhotoImage(width=w, height=h)
+            for step, gradient_color in enumerate(gradient_colors):
+                image.put(gradient_color, to=(0, int(band * step), w, int(band * (step + 1))))
+            self._gradient_images[gradient_colors] = image
+        return image
+    
+    def _paint_led(self, i, rgb):
+        """Show LED i in color rgb."""
+        canvas = self.led_canvas
+        glows = self._led_glow_ids[i]
+        
+        # Calculate brightness (0-1) - one sum drives brightness and lit
+        rgb_sum = rgb[0] + rgb[1] + rgb[2]
+        brightness = rgb_sum / (255 * 3)
+        is_lit = rgb_sum > 10
+        
+        if not is_lit:
+            # LED is off - subtle gray body and number
+            canvas.itemconfigure(f"lit{i}", state=tk.HIDDEN)
+            canvas.itemconfigure(self._led_body_ids[i], fill="#1a1a1a", outline="#2a2a2a")
+            canvas.itemconfigure(self._led_text_ids[i], fill="#333333", font=("Arial", 7))
+            return
+        
+        (glow_color, dim_glow, gradient_colors, border_color,
+         text_color, shadow_color) = led_palette(rgb, self.LED_GRADIENT_STEPS)
+        
+        # LED is lit - glow layers for depth with improved visual effect
+        # Outer glow (largest, creates diffusion effect)
+        if brightness > 0.2:
+            # Multiple glow layers for realistic diffusion, sized by brightness
+            x = self.LED_START_X + i * (self.LED_WIDTH + self.LED_SPACING)
+            y = self.LED_START_Y
+            for layer, item in zip(range(4, 0, -1), glows):
+                offset = int(layer * 2.5 * brightness)
+                canvas.coords(item, x - offset, y - offset,
+                              x + self.LED_WIDTH + offset, y + self.LED_HEIGHT + offset)
+            canvas.itemconfigure(f"dimglow{i}", fill=dim_glow, state=tk.NORMAL)
+            canvas.itemconfigure(f"hotglow{i}", fill=glow_color, state=tk.NORMAL)
+        else:
+            canvas.itemconfigure(f"glow{i}", state=tk.HIDDEN)
+        
+        # Smooth gradient effect - brightness decreases from top to bottom
+        canvas.itemconfigure(self._led_gradient_ids[i], image=self._gradient_image(gradient_colors),
+                             state=tk.NORMAL)
+        
+        # Subtle border for definition
+        canvas.itemconfigure(self._led_body_ids[i], fill="", outline=border_color)
+        
+        # LED number - adaptive color for readability, with a text shadow
+        canvas.itemconfigure(self._led_shadow_ids[i], fill=shadow_color, state=tk.NORMAL)
+        canvas.itemconfigure(self._led_text_ids[i], fill=text_color, font=("Arial", 7, "bold"))
     
     def update_simulation(self):
         """Main simulation loop."""
-        # Update simulation time (milliseconds) - using frame count * 16ms
-        import time
-        if self.start_time_ms == 0:
-            self.start_time_ms = int(time.time() * 1000)
-        self.current_time_ms = int(time.time() * 1000) - self.start_time_ms
+        if self._closing.is_set():
+            return
+        # Update simulation time (milliseconds) from the monotonic clock
+        now_ns = time.perf_counter_ns()
+        if self.start_time_ns is None:
+            self.start_time_ns = now_ns
+        self.current_time_ms = (now_ns - self.start_time_ns) // 1_000_000
         
         # Handle engine start animation
         if self.engine_starting and self.engine_start_frames > 0:
@@ -1669,7 +2203,7 @@ class LEDSimulator:
                 
                 # Update audio during start
                 if self.engine_start_frames == 60:
-                    self.audio_engine.start(self.rpm)
+                    self.audio_engine.start(self.rpm, self.car_config.redline_rpm)
                 else:
                     self.audio_engine.update_rpm(self.rpm)
                 
@@ -1685,7 +2219,7 @@ class LEDSimulator:
                         self.log_console(f"⚠️ LED send error: {e}")
                 
                 self.draw_gauges_and_ui()
-                self.root.after(16, self.update_simulation)
+                self._schedule_next_frame()
                 return
         
         # Handle engine stop animation
@@ -1719,7 +2253,7 @@ class LEDSimulator:
                     self.log_console(f"⚠️ LED send error: {e}")
             
             self.draw_gauges_and_ui()
-            self.root.after(16, self.update_simulation)
+            self._schedule_next_frame()
             return
         
         # Update animations based on state
@@ -1733,7 +2267,7 @@ class LEDSimulator:
                         self.pepper_position = 0
             
             # State 4: Update flash animation (flashing gap)
-            elif is_state_4(self.rpm):
+            elif classify_rpm_state(self.rpm) == 4:
                 # Calculate flash speed based on RPM
                 rpm_ratio = (self.rpm - STATE_4_RPM_MIN) / (STATE_4_RPM_MAX - STATE_4_RPM_MIN)
                 rpm_ratio = max(0.0, min(1.0, rpm_ratio))
@@ -1779,7 +2313,7 @@ class LEDSimulator:
                     self.log_console(f"⚠️ LED send error: {e}")
             
             self.draw_gauges_and_ui()
-            self.root.after(16, self.update_simulation)
+            self._schedule_next_frame()
             return
         
         if self.engine_running and not self.engine_stalled:
@@ -1789,30 +2323,40 @@ class LEDSimulator:
                 self.update_simulation()
                 return
             
-            # Physics simulation
+            # Physics simulation - car constants and the rpm/speed state are
+            # read into locals once and written back after the update
+            cc = self.car_config
+            idle_rpm = cc.idle_rpm
+            redline_rpm = cc.redline_rpm
+            rpm_accel_rate = cc.rpm_accel_rate
+            rpm_idle_return_rate = cc.rpm_idle_return_rate
+            rolling_resistance = cc.rolling_resistance
+            drag_coefficient = cc.drag_coefficient
+            gear = self.gear
+            rpm = self.rpm
+            speed = self.speed
+            
             if self.clutch:
                 # Clutch engaged - RPM can change independently
                 if self.throttle:
-                    self.rpm = min(self.car_config.redline_rpm, 
-                                 self.rpm + self.car_config.rpm_accel_rate)
+                    rpm = min(redline_rpm, rpm + rpm_accel_rate)
                 else:
                     # Return to idle - faster drop with clutch in
-                    if self.rpm > self.car_config.idle_rpm:
-                        self.rpm = max(self.car_config.idle_rpm, 
-                                     self.rpm - self.car_config.rpm_idle_return_rate)
+                    if rpm > idle_rpm:
+                        rpm = max(idle_rpm, rpm - rpm_idle_return_rate)
                 
                 # Speed naturally decays when clutch is in
-                if self.speed > 0:
-                    natural_decay = self.car_config.rolling_resistance + (self.speed * self.car_config.drag_coefficient)
-                    self.speed = max(0, self.speed - natural_decay)
+                if speed > 0:
+                    natural_decay = rolling_resistance + (speed * drag_coefficient)
+                    speed = max(0, speed - natural_decay)
                 
                 self.clutch_was_pressed = True
             else:
                 # Check if clutch was just released (transition from pressed to released)
-                if self.clutch_was_pressed and self.gear != 0:
+                if self.clutch_was_pressed and gear != 0:
                     # Calculate ideal RPM for current speed and gear
-                    ideal_rpm = calculate_rpm_from_speed(self.speed, self.gear, self.car_config)
-                    rpm_difference = abs(self.rpm - ideal_rpm)
+                    ideal_rpm = calculate_rpm_from_speed(speed, gear, cc)
+                    rpm_difference = abs(rpm - ideal_rpm)
                     
                     # If RPM mismatch is significant, simulate clutch slippage
                     if rpm_difference > 300:  # Threshold for noticeable slip
@@ -1826,67 +2370,64 @@ class LEDSimulator:
                 # Handle clutch slippage
                 if self.clutch_slipping and self.clutch_slip_counter > 0:
                     # During slip, RPM gradually moves toward ideal RPM
-                    ideal_rpm = calculate_rpm_from_speed(self.speed, self.gear, self.car_config)
+                    ideal_rpm = calculate_rpm_from_speed(speed, gear, cc)
                     
                     # Slip rate depends on remaining slip time - faster for realistic feel
                     slip_rate = 100 + (50 * (1.0 - self.clutch_slip_counter / 60.0))
                     
-                    if self.rpm > ideal_rpm:
+                    if rpm > ideal_rpm:
                         # Engine RPM drops during slip (absorbing flywheel energy)
-                        self.rpm = max(ideal_rpm, self.rpm - slip_rate)
+                        rpm = max(ideal_rpm, rpm - slip_rate)
                         # Speed increases slightly from engine braking
-                        if self.gear != 0:
-                            self.speed = min(self.speed + 0.2, calculate_max_speed_for_gear(self.gear, self.car_config))
+                        if gear != 0:
+                            speed = min(speed + 0.2, calculate_max_speed_for_gear(gear, cc))
                     else:
                         # Engine RPM rises during slip (clutch transfers power)
-                        self.rpm = min(ideal_rpm, self.rpm + slip_rate)
+                        rpm = min(ideal_rpm, rpm + slip_rate)
                         # Speed decreases slightly from clutch drag
-                        self.speed = max(0, self.speed - 0.3)
+                        speed = max(0, speed - 0.3)
                     
                     self.clutch_slip_counter -= 1
                     
                     if self.clutch_slip_counter <= 0:
                         self.clutch_slipping = False
                         # Snap to ideal RPM when slip completes
-                        self.rpm = ideal_rpm
+                        rpm = ideal_rpm
                 else:
                     # Normal driving - RPM linked to speed/gear
                     self.clutch_slipping = False
                 
-                target_rpm = calculate_rpm_from_speed(self.speed, self.gear, self.car_config)
-                
                 if self.throttle:
                     # Accelerate
-                    self.rpm = min(self.car_config.redline_rpm, 
-                                 self.rpm + self.car_config.rpm_accel_rate)
+                    rpm = min(redline_rpm, rpm + rpm_accel_rate)
                     
                     # Enforce gear speed limit
-                    max_speed_in_gear = calculate_max_speed_for_gear(self.gear, self.car_config)
-                    self.speed = min(max_speed_in_gear, 
-                                   self.speed + self.car_config.speed_accel_rate)
+                    max_speed_in_gear = calculate_max_speed_for_gear(gear, cc)
+                    speed = min(max_speed_in_gear, speed + cc.speed_accel_rate)
                 elif self.brake:
                     # Brake
-                    self.speed = max(0, self.speed - self.car_config.speed_decel_rate)
-                    target_rpm = calculate_rpm_from_speed(self.speed, self.gear, self.car_config)
-                    self.rpm = max(target_rpm, self.rpm - self.car_config.rpm_decel_rate)
+                    speed = max(0, speed - cc.speed_decel_rate)
+                    target_rpm = calculate_rpm_from_speed(speed, gear, cc)
+                    rpm = max(target_rpm, rpm - cc.rpm_decel_rate)
                 else:
                     # Coast - natural deceleration from drag and rolling resistance
-                    if self.speed > 0:
-                        natural_decay = self.car_config.rolling_resistance + (self.speed * self.car_config.drag_coefficient)
-                        self.speed = max(0, self.speed - natural_decay)
+                    if speed > 0:
+                        natural_decay = rolling_resistance + (speed * drag_coefficient)
+                        speed = max(0, speed - natural_decay)
                     
                     # RPM follows gear ratio - faster tracking
-                    target_rpm = calculate_rpm_from_speed(self.speed, self.gear, self.car_config)
-                    if abs(self.rpm - target_rpm) > 50:
-                        if self.rpm > target_rpm:
-                            self.rpm = max(target_rpm, 
-                                         self.rpm - self.car_config.rpm_idle_return_rate)
+                    target_rpm = calculate_rpm_from_speed(speed, gear, cc)
+                    if abs(rpm - target_rpm) > 50:
+                        if rpm > target_rpm:
+                            rpm = max(target_rpm, rpm - rpm_idle_return_rate)
                         else:
                             # Faster rise when RPM needs to catch up
-                            self.rpm = min(target_rpm, 
-                                         self.rpm + self.car_config.rpm_idle_return_rate)
+                            rpm = min(target_rpm, rpm + rpm_idle_return_rate)
                     else:
-                        self.rpm = target_rpm
+                        rpm = target_rpm
+            
+            self.rpm = rpm
+            self.speed = speed
             
             # Check if RPM gets too low for current conditions - stall the engine
             min_speed = calculate_min_speed_for_gear(self.gear, self.car_config)
@@ -1921,8 +2462,12 @@ class LEDSimulator:
             import traceback
             print(f"Draw error: {e}\n{traceback.format_exc()}")
         
-        # Schedule next frame (60 FPS)
-        self.root.after(16, self.update_simulation)
+        self._schedule_next_frame()
+    
+    def _schedule_next_frame(self):
+        """Queue the next update_simulation against a fixed 60 FPS deadline."""
+        self._next_deadline, delay_ms = next_frame_delay(self._next_deadline, FRAME_INTERVAL)
+        self.root.after(delay_ms, self.update_simulation)
     
     def draw_gauges_and_ui(self):
         """Draw all gauges and update UI elements."""
@@ -2065,18 +2610,45 @@ class LEDSimulator:
             self.on_close()
     
     def log_console(self, message):
-        """Add message to debug console with timestamp."""
-        try:
-            self.console.config(state=tk.NORMAL)
-            timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]  # Include milliseconds
-            self.console.insert(tk.END, f"[{timestamp}] {message}\n")
-            self.console.see(tk.END)
-            self.console.config(state=tk.DISABLED)
-        except Exception as e:
-            print(f"Console log error: {e}")
+        """Queue message for the debug console (timestamped and written by _flush_console)."""
+        self._console_queue.append((time.time(), message))
+    
+    def _flush_console(self):
+        """Write all queued console lines in one insert, then reschedule (every 50ms)."""
+        if self._closing.is_set():
+            return
+        if self._console_queue:
+            lines = []
+            last_sec = None
+            while self._console_queue:
+                logged_at, message = self._console_queue.popleft()
+                # HH:MM:SS only changes once a second - format it once per second
+                sec = int(logged_at)
+                if sec != last_sec:
+                    last_sec = sec
+                    hms = time.strftime("%H:%M:%S", time.localtime(sec))
+                millis = int((logged_at - sec) * 1000)
+                lines.append(f"[{hms}.{millis:03d}] {message}\n")
+            try:
+                # Only follow new output if the view was already at the bottom -
+                # leaves history alone while the user scrolls back through it
+                follow = self.console.yview()[1] >= 0.999
+                self.console.config(state=tk.NORMAL)
+                self.console.insert(tk.END, "".join(lines))
+                # Keep the widget bounded - Text redraws slow down as it grows
+                end_line = int(self.console.index('end-1c').split('.')[0])
+                if end_line > self.MAX_CONSOLE_LINES:
+                    self.console.delete('1.0', f'{end_line - self.MAX_CONSOLE_LINES + 1}.0')
+                if follow:
+                    self.console.see(tk.END)
+                self.console.config(state=tk.DISABLED)
+            except Exception as e:
+                print(f"Console log error: {e}")
+        self.root.after(50, self._flush_console)
     
     def clear_console(self):
         """Clear console output."""
+        self._console_queue.clear()
         self.console.config(state=tk.NORMAL)
         self.console.delete(1.0, tk.END)
         self.console.config(state=tk.DISABLED)
@@ -2084,6 +2656,11 @@ class LEDSimulator:
     
     def on_close(self):
         """Clean up and close the simulator."""
+        if self._closing.is_set():
+            return
+        # Stop the simulation/console/port callbacks from rescheduling themselves
+        self._closing.set()
+        self._port_rescan.set()  # Wake the port scanner so it can exit
         self.log_console("Shutting down simulator...")
         # Disconnect Arduino if connected
         if self.arduino_connected and self.arduino_port:
@@ -2094,7 +2671,8 @@ class LEDSimulator:
             except Exception as e:
                 self.log_console(f"Error disconnecting Arduino: {e}")
         self.audio_engine.cleanup()
-        self.root.destroy()
+        # Destroy once already-queued callbacks have run and seen _closing
+        self.root.after(100, self.root.destroy)
 
 # ============================================================================
 # Main Entry Point